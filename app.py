@@ -5,95 +5,172 @@
 """
 
 from fastapi import FastAPI, Request, Form, HTTPException
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 import uvicorn
+import asyncio
+import functools
+import jinja2
 import json
+import threading
+from contextlib import asynccontextmanager
 from typing import Optional
+from cachetools import TTLCache
 from news_agent import NewsAgent
 import os
 
-app = FastAPI(title="智能新闻搜索智能体", description="根据用户输入搜索相关新闻并提供深度分析")
+# 新闻智能体实例：在lifespan中按worker惰性创建，避免导入时构建
+news_agent: Optional[NewsAgent] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global news_agent
+    news_agent = NewsAgent()
+    yield
+
+
+app = FastAPI(
+    title="智能新闻搜索智能体",
+    description="根据用户输入搜索相关新闻并提供深度分析",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
+
+# 压缩响应：新闻结果动辄数十KB中文文本，gzip后大幅减少传输量
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 # 设置模板和静态文件
-templates = Jinja2Templates(directory="templates")
+# auto_reload=False跳过每次渲染的mtime检查，编译结果持久化到字节码缓存
+os.makedirs(".jinja_cache", exist_ok=True)
+templates = Jinja2Templates(
+    directory="templates",
+    auto_reload=False,
+    cache_size=400,
+    bytecode_cache=jinja2.FileSystemBytecodeCache(".jinja_cache"),
+)
 
 # 如果static目录存在，则挂载静态文件
 if os.path.exists("static"):
     app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# 创建新闻智能体实例
-news_agent = NewsAgent()
+# 热门查询结果缓存：新闻查询呈长尾分布，重复查询直接命中缓存
+# TTL设为5分钟，过期后重新搜索以保证新闻时效性
+_search_cache = TTLCache(maxsize=1024, ttl=300)
+_search_cache_lock = threading.Lock()
+
+
+def _cached_search(query: str, limit: int):
+    """带TTL缓存的新闻搜索，按(query, limit)命中"""
+    key = (query, limit)
+    with _search_cache_lock:
+        cached = _search_cache.get(key)
+    if cached is not None:
+        return cached
+
+    results = news_agent.search_news(query, limit=limit)
+
+    with _search_cache_lock:
+        _search_cache[key] = results
+    return results
+
+
+# /related 结果缓存：以标题提取出的关键词集合作为键，
+# 措辞不同但关键词相同的近似标题可以命中同一条缓存
+_related_cache = TTLCache(maxsize=512, ttl=300)
+_related_cache_lock = threading.Lock()
+
+
+def _cached_related(selected_news: dict, limit: int):
+    """带TTL缓存的相关新闻搜索，按关键词集合命中近似查询"""
+    keywords = news_agent._extract_keywords(selected_news.get("title", ""))
+    key = (tuple(sorted(keywords)), limit)
+    with _related_cache_lock:
+        cached = _related_cache.get(key)
+    if cached is not None:
+        return cached
+
+    results = news_agent.search_related_news(selected_news, limit=limit)
+
+    with _related_cache_lock:
+        _related_cache[key] = results
+    return results
+
+def api_result(fn):
+    """统一API响应包装：成功时并入success标记，失败时返回错误信息"""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        try:
+            return {"success": True, **(await fn(*args, **kwargs))}
+        except HTTPException:
+            raise
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    return wrapper
+
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """主页"""
     return templates.TemplateResponse("index.html", {"request": request})
 
-@app.post("/search", response_class=JSONResponse)
+@app.post("/search", response_class=ORJSONResponse)
+@api_result
 async def search_news(query: str = Form(...), limit: int = Form(10)):
     """搜索新闻API"""
-    try:
-        if not query.strip():
-            raise HTTPException(status_code=400, detail="搜索关键词不能为空")
-        
-        # 搜索新闻
-        news_results = news_agent.search_news(query.strip(), limit=limit)
-        
-        # 获取摘要统计
-        summary = news_agent.get_news_summary(news_results)
-        
-        return {
-            "success": True,
-            "query": query,
-            "results": news_results,
-            "summary": summary
-        }
-    
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e)
-        }
+    if not query.strip():
+        raise HTTPException(status_code=400, detail="搜索关键词不能为空")
+
+    # 搜索新闻（同步阻塞调用放入线程池，避免阻塞事件循环）
+    loop = asyncio.get_running_loop()
+    news_results = await loop.run_in_executor(
+        None, _cached_search, query.strip(), limit
+    )
+
+    # 获取摘要统计
+    summary = news_agent.get_news_summary(news_results)
 
-@app.post("/related", response_class=JSONResponse)
+    return {
+        "query": query,
+        "results": news_results,
+        "summary": summary
+    }
+
+@app.post("/related", response_class=ORJSONResponse)
+@api_result
 async def search_related_news(
-    title: str = Form(...), 
-    summary: str = Form(""), 
+    title: str = Form(...),
+    summary: str = Form(""),
     url: str = Form(""),
     limit: int = Form(8)
 ):
     """搜索相关新闻API"""
-    try:
-        if not title.strip():
-            raise HTTPException(status_code=400, detail="新闻标题不能为空")
-        
-        # 构建选中的新闻对象
-        selected_news = {
-            "title": title.strip(),
-            "summary": summary.strip(),
-            "url": url.strip()
-        }
-        
-        # 搜索相关新闻
-        related_results = news_agent.search_related_news(selected_news, limit=limit)
-        
-        # 获取摘要统计
-        summary_stats = news_agent.get_news_summary(related_results)
-        
-        return {
-            "success": True,
-            "selected_news": selected_news,
-            "results": related_results,
-            "summary": summary_stats
-        }
-    
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e)
-        }
+    if not title.strip():
+        raise HTTPException(status_code=400, detail="新闻标题不能为空")
+
+    # 构建选中的新闻对象
+    selected_news = {
+        "title": title.strip(),
+        "summary": summary.strip(),
+        "url": url.strip()
+    }
+
+    # 搜索相关新闻（同步阻塞调用放入线程池，避免阻塞事件循环）
+    loop = asyncio.get_running_loop()
+    related_results = await loop.run_in_executor(
+        None, _cached_related, selected_news, limit
+    )
+
+    # 获取摘要统计
+    summary_stats = news_agent.get_news_summary(related_results)
+
+    return {
+        "selected_news": selected_news,
+        "results": related_results,
+        "summary": summary_stats
+    }
 
 @app.get("/api/health")
 async def health_check():
@@ -105,4 +182,13 @@ if __name__ == "__main__":
     os.makedirs("templates", exist_ok=True)
     os.makedirs("static", exist_ok=True)
     
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=max(2, os.cpu_count() or 1),
+        reload=False,
+        log_level="warning",
+    )
\ No newline at end of file
@@ -1,160 +1,225 @@
 """
 地理问答数据集生成器
 """
-import json
+import functools
+import orjson
 import random
+import sys
 from typing import List, Dict, Tuple
 
-class GeographyQADataset:
-    def __init__(self):
-        self.qa_pairs = []
-        self._generate_dataset()
-    
-    def _generate_dataset(self):
-        """生成地理问答数据集"""
-        
-        # 中国省份和首府
-        provinces_capitals = {
-            "北京": "北京", "天津": "天津", "上海": "上海", "重庆": "重庆",
-            "河北": "石家庄", "山西": "太原", "辽宁": "沈阳", "吉林": "长春",
-            "黑龙江": "哈尔滨", "江苏": "南京", "浙江": "杭州", "安徽": "合肥",
-            "福建": "福州", "江西": "南昌", "山东": "济南", "河南": "郑州",
-            "湖北": "武汉", "湖南": "长沙", "广东": "广州", "海南": "海口",
-            "四川": "成都", "贵州": "贵阳", "云南": "昆明", "陕西": "西安",
-            "甘肃": "兰州", "青海": "西宁", "台湾": "台北", "内蒙古": "呼和浩特",
-            "广西": "南宁", "西藏": "拉萨", "宁夏": "银川", "新疆": "乌鲁木齐"
-        }
-        
-        # 主要河流
-        rivers = {
-            "长江": {"长度": "6300公里", "发源地": "青藏高原", "流向": "东海"},
-            "黄河": {"长度": "5464公里", "发源地": "青藏高原", "流向": "渤海"},
-            "珠江": {"长度": "2320公里", "发源地": "云贵高原", "流向": "南海"},
-            "松花江": {"长度": "1900公里", "发源地": "长白山", "流向": "黑龙江"}
-        }
-        
-        # 主要山脉
-        mountains = {
-            "喜马拉雅山": {"最高峰": "珠穆朗玛峰", "海拔": "8848.86米", "位置": "中国西藏与尼泊尔边界"},
-            "昆仑山": {"最高峰": "公格尔峰", "海拔": "7649米", "位置": "新疆、青海、西藏"},
-            "天山": {"最高峰": "托木尔峰", "海拔": "7443米", "位置": "新疆"},
-            "秦岭": {"最高峰": "太白山", "海拔": "3771米", "位置": "陕西、甘肃、河南"}
-        }
-        
-        # 生成省份首府问答
-        for province, capital in provinces_capitals.items():
-            self.qa_pairs.extend([
-                {
-                    "question": f"{province}省的省会是哪里？",
-                    "answer": f"{province}省的省会是{capital}。",
-                    "category": "省会城市"
-                },
-                {
-                    "question": f"{capital}是哪个省的省会？",
-                    "answer": f"{capital}是{province}省的省会。",
-                    "category": "省会城市"
-                }
-            ])
-        
-        # 生成河流问答
-        for river, info in rivers.items():
-            self.qa_pairs.extend([
-                {
-                    "question": f"{river}有多长？",
-                    "answer": f"{river}全长{info['长度']}。",
-                    "category": "河流"
-                },
-                {
-                    "question": f"{river}发源于哪里？",
-                    "answer": f"{river}发源于{info['发源地']}。",
-                    "category": "河流"
-                },
-                {
-                    "question": f"{river}最终流向哪里？",
-                    "answer": f"{river}最终流入{info['流向']}。",
-                    "category": "河流"
-                }
-            ])
-        
-        # 生成山脉问答
-        for mountain, info in mountains.items():
-            self.qa_pairs.extend([
-                {
-                    "question": f"{mountain}的最高峰是什么？",
-                    "answer": f"{mountain}的最高峰是{info['最高峰']}。",
-                    "category": "山脉"
-                },
-                {
-                    "question": f"{info['最高峰']}海拔多高？",
-                    "answer": f"{info['最高峰']}海拔{info['海拔']}。",
-                    "category": "山脉"
-                },
-                {
-                    "question": f"{mountain}位于哪里？",
-                    "answer": f"{mountain}位于{info['位置']}。",
-                    "category": "山脉"
-                }
-            ])
-        
-        # 添加一些综合性问题
-        comprehensive_qa = [
+# 问答模板常量：在生成循环中复用同一批格式串，避免逐条构造
+Q_CAPITAL_OF_PROVINCE = "{province}省的省会是哪里？"
+A_CAPITAL_OF_PROVINCE = "{province}省的省会是{capital}。"
+Q_PROVINCE_OF_CAPITAL = "{capital}是哪个省的省会？"
+A_PROVINCE_OF_CAPITAL = "{capital}是{province}省的省会。"
+Q_RIVER_LENGTH = "{river}有多长？"
+A_RIVER_LENGTH = "{river}全长{length}。"
+Q_RIVER_SOURCE = "{river}发源于哪里？"
+A_RIVER_SOURCE = "{river}发源于{source}。"
+Q_RIVER_MOUTH = "{river}最终流向哪里？"
+A_RIVER_MOUTH = "{river}最终流入{mouth}。"
+Q_MOUNTAIN_PEAK = "{mountain}的最高峰是什么？"
+A_MOUNTAIN_PEAK = "{mountain}的最高峰是{peak}。"
+Q_PEAK_ALTITUDE = "{peak}海拔多高？"
+A_PEAK_ALTITUDE = "{peak}海拔{altitude}。"
+Q_MOUNTAIN_LOCATION = "{mountain}位于哪里？"
+A_MOUNTAIN_LOCATION = "{mountain}位于{location}。"
+
+# 分类名驻留为单一字符串对象，上百条问答共享引用
+CATEGORY_CAPITAL = sys.intern("省会城市")
+CATEGORY_RIVER = sys.intern("河流")
+CATEGORY_MOUNTAIN = sys.intern("山脉")
+CATEGORY_GENERAL = sys.intern("综合")
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+@functools.lru_cache(maxsize=1)
+def _build_qa_pairs() -> Tuple[Dict, ...]:
+    """生成地理问答数据集（纯确定性工作，进程内只构建一次）"""
+    qa_pairs = []
+
+    # 中国省份和首府
+    provinces_capitals = {
+        "北京": "北京", "天津": "天津", "上海": "上海", "重庆": "重庆",
+        "河北": "石家庄", "山西": "太原", "辽宁": "沈阳", "吉林": "长春",
+        "黑龙江": "哈尔滨", "江苏": "南京", "浙江": "杭州", "安徽": "合肥",
+        "福建": "福州", "江西": "南昌", "山东": "济南", "河南": "郑州",
+        "湖北": "武汉", "湖南": "长沙", "广东": "广州", "海南": "海口",
+        "四川": "成都", "贵州": "贵阳", "云南": "昆明", "陕西": "西安",
+        "甘肃": "兰州", "青海": "西宁", "台湾": "台北", "内蒙古": "呼和浩特",
+        "广西": "南宁", "西藏": "拉萨", "宁夏": "银川", "新疆": "乌鲁木齐"
+    }
+
+    # 主要河流
+    rivers = {
+        "长江": {"长度": "6300公里", "发源地": "青藏高原", "流向": "东海"},
+        "黄河": {"长度": "5464公里", "发源地": "青藏高原", "流向": "渤海"},
+        "珠江": {"长度": "2320公里", "发源地": "云贵高原", "流向": "南海"},
+        "松花江": {"长度": "1900公里", "发源地": "长白山", "流向": "黑龙江"}
+    }
+
+    # 主要山脉
+    mountains = {
+        "喜马拉雅山": {"最高峰": "珠穆朗玛峰", "海拔": "8848.86米", "位置": "中国西藏与尼泊尔边界"},
+        "昆仑山": {"最高峰": "公格尔峰", "海拔": "7649米", "位置": "新疆、青海、西藏"},
+        "天山": {"最高峰": "托木尔峰", "海拔": "7443米", "位置": "新疆"},
+        "秦岭": {"最高峰": "太白山", "海拔": "3771米", "位置": "陕西、甘肃、河南"}
+    }
+
+    # 生成省份首府问答
+    for province, capital in provinces_capitals.items():
+        qa_pairs.extend([
+            {
+                "question": Q_CAPITAL_OF_PROVINCE.format(province=province),
+                "answer": A_CAPITAL_OF_PROVINCE.format(province=province, capital=capital),
+                "category": CATEGORY_CAPITAL
+            },
+            {
+                "question": Q_PROVINCE_OF_CAPITAL.format(capital=capital),
+                "answer": A_PROVINCE_OF_CAPITAL.format(capital=capital, province=province),
+                "category": CATEGORY_CAPITAL
+            }
+        ])
+
+    # 生成河流问答
+    for river, info in rivers.items():
+        qa_pairs.extend([
+            {
+                "question": Q_RIVER_LENGTH.format(river=river),
+                "answer": A_RIVER_LENGTH.format(river=river, length=info['长度']),
+                "category": CATEGORY_RIVER
+            },
+            {
+                "question": Q_RIVER_SOURCE.format(river=river),
+                "answer": A_RIVER_SOURCE.format(river=river, source=info['发源地']),
+                "category": CATEGORY_RIVER
+            },
+            {
+                "question": Q_RIVER_MOUTH.format(river=river),
+                "answer": A_RIVER_MOUTH.format(river=river, mouth=info['流向']),
+                "category": CATEGORY_RIVER
+            }
+        ])
+
+    # 生成山脉问答
+    for mountain, info in mountains.items():
+        qa_pairs.extend([
             {
-                "question": "中国最长的河流是什么？",
-                "answer": "中国最长的河流是长江，全长6300公里。",
-                "category": "综合"
+                "question": Q_MOUNTAIN_PEAK.format(mountain=mountain),
+                "answer": A_MOUNTAIN_PEAK.format(mountain=mountain, peak=info['最高峰']),
+                "category": CATEGORY_MOUNTAIN
             },
             {
-                "question": "世界最高峰在中国的哪个地区？",
-                "answer": "世界最高峰珠穆朗玛峰位于中国西藏与尼泊尔的边界上。",
-                "category": "综合"
+                "question": Q_PEAK_ALTITUDE.format(peak=info['最高峰']),
+                "answer": A_PEAK_ALTITUDE.format(peak=info['最高峰'], altitude=info['海拔']),
+                "category": CATEGORY_MOUNTAIN
             },
             {
-                "question": "中国有多少个省级行政区？",
-                "answer": "中国共有34个省级行政区，包括23个省、5个自治区、4个直辖市和2个特别行政区。",
-                "category": "综合"
+                "question": Q_MOUNTAIN_LOCATION.format(mountain=mountain),
+                "answer": A_MOUNTAIN_LOCATION.format(mountain=mountain, location=info['位置']),
+                "category": CATEGORY_MOUNTAIN
             }
-        ]
-        
-        self.qa_pairs.extend(comprehensive_qa)
-        
-        # 随机打乱数据
-        random.shuffle(self.qa_pairs)
-    
-    def get_train_test_split(self, test_ratio: float = 0.2) -> Tuple[List[Dict], List[Dict]]:
-        """获取训练和测试数据集"""
+        ])
+
+    # 添加一些综合性问题
+    comprehensive_qa = [
+        {
+            "question": "中国最长的河流是什么？",
+            "answer": "中国最长的河流是长江，全长6300公里。",
+            "category": CATEGORY_GENERAL
+        },
+        {
+            "question": "世界最高峰在中国的哪个地区？",
+            "answer": "世界最高峰珠穆朗玛峰位于中国西藏与尼泊尔的边界上。",
+            "category": CATEGORY_GENERAL
+        },
+        {
+            "question": "中国有多少个省级行政区？",
+            "answer": "中国共有34个省级行政区，包括23个省、5个自治区、4个直辖市和2个特别行政区。",
+            "category": CATEGORY_GENERAL
+        }
+    ]
+
+    qa_pairs.extend(comprehensive_qa)
+
+    return tuple(qa_pairs)
+
+
+class GeographyQADataset:
+    def __init__(self):
+        # 缓存的元组只生成一次，每个实例取可变副本；保持稳定的生成顺序，
+        # 打乱统一交给get_train_test_split的固定seed置换——否则这里
+        # 一次无seed的shuffle就会让同样的seed得到不同的划分
+        self.qa_pairs = list(_build_qa_pairs())
+
+    def get_train_test_split(self, test_ratio: float = 0.2, seed: int = 42) -> Tuple[List[Dict], List[Dict]]:
+        """获取训练和测试数据集（固定seed保证划分可复现）"""
         split_idx = int(len(self.qa_pairs) * (1 - test_ratio))
-        train_data = self.qa_pairs[:split_idx]
-        test_data = self.qa_pairs[split_idx:]
+
+        if HAS_NUMPY:
+            # 向量化的随机索引划分，大数据集下比列表切片更快
+            arr = np.array(self.qa_pairs, dtype=object)
+            idx = np.random.default_rng(seed).permutation(len(arr))
+            return arr[idx[:split_idx]].tolist(), arr[idx[split_idx:]].tolist()
+
+        # numpy不可用时退回纯Python实现
+        indices = list(range(len(self.qa_pairs)))
+        random.Random(seed).shuffle(indices)
+        train_data = [self.qa_pairs[i] for i in indices[:split_idx]]
+        test_data = [self.qa_pairs[i] for i in indices[split_idx:]]
         return train_data, test_data
-    
+
+    def add_qa_pair(self, question: str, answer: str, category: str = CATEGORY_GENERAL,
+                    filepath: str = None):
+        """追加一条问答并可选持久化
+
+        持久化走JSONL追加（O(1)），而不是整个数据集重写一遍（O(N)）。
+        """
+        item = {"question": question, "answer": answer, "category": category}
+        self.qa_pairs.append(item)
+        if filepath:
+            with open(filepath, 'ab') as f:
+                f.write(orjson.dumps(item) + b'\n')
+
+    def load_jsonl(self, filepath: str):
+        """从JSONL文件追加加载增量问答对"""
+        with open(filepath, 'rb') as f:
+            self.qa_pairs.extend(orjson.loads(line) for line in f if line.strip())
+
     def save_dataset(self, filepath: str):
         """保存数据集到文件"""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.qa_pairs, f, ensure_ascii=False, indent=2)
-    
+        # orjson直接输出utf-8字节，比标准库json快数倍
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(self.qa_pairs, option=orjson.OPT_INDENT_2))
+
     def load_dataset(self, filepath: str):
         """从文件加载数据集"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            self.qa_pairs = json.load(f)
+        with open(filepath, 'rb') as f:
+            self.qa_pairs = orjson.loads(f.read())
 
 if __name__ == "__main__":
     # 生成数据集
     dataset = GeographyQADataset()
-    
+
     # 保存完整数据集
     dataset.save_dataset("/workspace/data/geography_qa.json")
-    
+
     # 获取训练和测试数据
     train_data, test_data = dataset.get_train_test_split()
-    
+
     # 保存训练和测试数据
-    with open("/workspace/data/train_data.json", 'w', encoding='utf-8') as f:
-        json.dump(train_data, f, ensure_ascii=False, indent=2)
-    
-    with open("/workspace/data/test_data.json", 'w', encoding='utf-8') as f:
-        json.dump(test_data, f, ensure_ascii=False, indent=2)
-    
+    with open("/workspace/data/train_data.json", 'wb') as f:
+        f.write(orjson.dumps(train_data, option=orjson.OPT_INDENT_2))
+
+    with open("/workspace/data/test_data.json", 'wb') as f:
+        f.write(orjson.dumps(test_data, option=orjson.OPT_INDENT_2))
+
     print(f"数据集生成完成！")
     print(f"总计问答对数: {len(dataset.qa_pairs)}")
     print(f"训练数据: {len(train_data)}")
-    print(f"测试数据: {len(test_data)}")
\ No newline at end of file
+    print(f"测试数据: {len(test_data)}")
@@ -4,29 +4,41 @@
 智能新闻搜索智能体 - 功能演示脚本
 """
 
+import asyncio
 import requests
 import json
-import time
 from news_agent import NewsAgent
 
-def demo_cli():
+async def demo_cli():
     """命令行演示"""
     print("🤖 智能新闻搜索智能体 - 功能演示")
     print("=" * 50)
-    
+
     agent = NewsAgent()
-    
+
     # 演示搜索功能
     test_queries = ["人工智能", "新能源", "区块链", "5G技术"]
-    
-    for query in test_queries:
+
+    # 并发搜索所有关键词，用信号量限制并发数代替逐条sleep节流
+    semaphore = asyncio.Semaphore(2)
+
+    async def search_one(query):
+        async with semaphore:
+            try:
+                return await asyncio.to_thread(agent.search_news, query, 3)
+            except Exception as e:
+                return e
+
+    all_results = await asyncio.gather(*(search_one(q) for q in test_queries))
+
+    for query, results in zip(test_queries, all_results):
         print(f"\n🔍 搜索关键词: {query}")
         print("-" * 30)
-        
+
         try:
-            # 搜索新闻
-            results = agent.search_news(query, limit=3)
-            
+            if isinstance(results, Exception):
+                raise results
+
             if results:
                 print(f"✅ 找到 {len(results)} 条相关新闻:")
                 for i, news in enumerate(results, 1):
@@ -49,22 +61,26 @@ def demo_cli():
                         print("❌ 未找到相关新闻")
             else:
                 print("❌ 未找到相关新闻")
-                
+
         except Exception as e:
             print(f"❌ 搜索失败: {e}")
-        
-        time.sleep(1)  # 避免过快请求
 
 def demo_web_api():
     """Web API演示"""
     print("\n🌐 Web API功能演示")
     print("=" * 50)
-    
+
     base_url = "http://localhost:8000"
-    
+
+    # 复用同一个Session，通过keep-alive连接池避免每次请求重新建连
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=10)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
     # 检查健康状态
     try:
-        response = requests.get(f"{base_url}/api/health", timeout=5)
+        response = session.get(f"{base_url}/api/health", timeout=5)
         if response.status_code == 200:
             print("✅ Web服务运行正常")
             print(f"   服务状态: {response.json()}")
@@ -84,7 +100,7 @@ def demo_web_api():
             'limit': '3'
         }
         
-        response = requests.post(f"{base_url}/search", data=search_data, timeout=10)
+        response = session.post(f"{base_url}/search", data=search_data, timeout=10)
         
         if response.status_code == 200:
             result = response.json()
@@ -111,11 +127,11 @@ def main():
     choice = input("\n请输入选择 (1/2/3): ").strip()
     
     if choice == "1":
-        demo_cli()
+        asyncio.run(demo_cli())
     elif choice == "2":
         demo_web_api()
     elif choice == "3":
-        demo_cli()
+        asyncio.run(demo_cli())
         demo_web_api()
     else:
         print("❌ 无效选择")
@@ -6,16 +6,105 @@ Mac系统监控应用程序
 
 import tkinter as tk
 from tkinter import ttk, font
+import os
 import psutil
-import threading
 import time
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime
 import platform
-from collections import deque
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import matplotlib.animation as animation
+import numpy as np
+
+# matplotlib按需导入：冷启动省掉200ms+的导入时间和约40MB常驻内存，
+# sparkline模式下整个进程都不会加载它
+FigureCanvasTkAgg = None
+Figure = None
+
+
+def _ensure_mpl():
+    """首次创建图表时才导入matplotlib并完成一次性配置"""
+    global FigureCanvasTkAgg, Figure
+    if Figure is not None:
+        return
+    import matplotlib as mpl
+    # 先锁定TkAgg后端，避免pyplot式的后端探测
+    mpl.use('TkAgg')
+    # 小尺寸趋势图用fast样式+路径简化，显著降低Agg栅格化成本
+    mpl.style.use('fast')
+    mpl.rcParams['path.simplify'] = True
+    mpl.rcParams['path.simplify_threshold'] = 1.0
+    mpl.rcParams['agg.path.chunksize'] = 10000
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg as _Canvas
+    from matplotlib.figure import Figure as _Figure
+    FigureCanvasTkAgg, Figure = _Canvas, _Figure
+
+BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+# 空闲时大量字段是0，返回共享常量避免每次格式化新建字符串
+_ZERO_BYTES = "0.00 B"
+
+# sparkline字符梯度：htop/btop式的unicode块字符趋势图
+_SPARK = ' ▁▂▃▄▅▆▇█'
+
+
+def _safe(fn, retries=2, default=None):
+    """psutil在/proc瞬时不完整时可能抛错，短暂重试避免丢失采样点"""
+    for _ in range(retries + 1):
+        try:
+            return fn()
+        except (TypeError, KeyError, OSError):
+            time.sleep(0.02)
+    return default
+
+
+class RingBuffer:
+    """预分配的NumPy环形缓冲区，追加O(1)且绘图取值不产生Python列表拷贝"""
+
+    def __init__(self, size=60):
+        self.buf = np.zeros(size, dtype=np.float32)
+        self.size = size
+        self.head = 0
+        self.count = 0
+
+    def append(self, value):
+        self.buf[self.head] = value
+        self.head = (self.head + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    def __len__(self):
+        return self.count
+
+    def values(self):
+        """按时间顺序返回有效数据（装满后展开为连续数组）"""
+        if self.count < self.size:
+            return self.buf[:self.count]
+        return np.concatenate((self.buf[self.head:], self.buf[:self.head]))
+
+    def max(self):
+        return float(self.buf[:self.count].max()) if self.count else 0.0
+
+    def last(self):
+        return float(self.buf[self.head - 1]) if self.count else 0.0
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """一次采样的完整结果
+
+    每个tick构造新实例并整体替换引用，任何读取方（UI刷新、未来的
+    导出接口等）拿到的永远是一致的一组数据。
+    """
+    # 手写__slots__省掉每实例__dict__；dataclass的slots=True要3.10+，
+    # 而macOS自带的python3还是3.9
+    __slots__ = ('cpu_percent', 'memory', 'sent_speed', 'recv_speed',
+                 'total_sent', 'total_recv', 'timestamp')
+    cpu_percent: float
+    memory: object
+    sent_speed: float
+    recv_speed: float
+    total_sent: int
+    total_recv: int
+    timestamp: float
 
 
 class MacSystemMonitor:
@@ -24,28 +113,70 @@ class MacSystemMonitor:
         self.root.title("Mac系统监控器")
         self.root.geometry("1000x700")
         self.root.configure(bg='#f0f0f0')
+
+        # 图表模式：'chart'用matplotlib折线图，'spark'用unicode sparkline。
+        # sparkline把每tick的绘图成本降到一次Label赋值，适合低配机器
+        self.chart_mode = os.environ.get('MONITOR_CHART_MODE', 'chart')
         
         # 设置应用图标和样式
         self.setup_styles()
         
-        # 数据存储
-        self.cpu_data = deque(maxlen=60)  # 保存60个数据点
-        self.memory_data = deque(maxlen=60)
-        self.network_sent_data = deque(maxlen=60)
-        self.network_recv_data = deque(maxlen=60)
-        
-        # 网络统计基准值
-        self.network_stats_base = psutil.net_io_counters()
+        # 数据存储：固定60个数据点的环形缓冲区
+        self.cpu_data = RingBuffer(60)
+        self.memory_data = RingBuffer(60)
+        self.network_sent_data = RingBuffer(60)
+        self.network_recv_data = RingBuffer(60)
+        # 绘图x轴只分配一次
+        self._x = np.arange(60)
+        
+        # 网络统计基准值：只保留用到的两个计数器标量，不持有整个namedtuple
+        _net = psutil.net_io_counters()
+        self._prev_sent = _net.bytes_sent
+        self._prev_recv = _net.bytes_recv
         self.last_network_time = time.time()
-        
+
+        # 图表背景缓存失效标记（窗口resize后需要重新捕获）
+        self._charts_dirty = False
+
+        # 文本每秒刷新，图表每chart_stride个tick刷新一次以降低绘制开销
+        self._tick = 0
+        self.chart_stride = 3
+        
+        # 最新采样快照
+        self._snapshot = None
+        # 快照环形缓冲：maxlen封顶，1Hz投递永远只保留最近5分钟，
+        # 没有消费者时旧快照自动被挤掉而不是无限堆积；
+        # deque的append是加锁粒度极小的C实现，采样路径几乎零成本
+        self.sample_buf = deque(maxlen=300)
+
+        # 动态文本统一走StringVar：set()只在值变化时触发Tk重绘，
+        # 比逐个config(text=...)省去选项解析开销
+        self.cpu_usage_var = tk.StringVar(value="CPU使用率: 0%")
+        self.memory_usage_var = tk.StringVar(value="内存使用率: 0%")
+        self.memory_detail_var = tk.StringVar()
+        self.network_speed_var = tk.StringVar()
+        self.network_stats_var = tk.StringVar()
+        self.time_var = tk.StringVar()
+
+        # 预热CPU采样：之后interval=None按两次调用间的差值计算，不再阻塞
+        psutil.cpu_percent(interval=None)
+
+        # 物理内存总量整个进程生命周期不变，格式化一次反复使用
+        self._mem_total_str = self.format_bytes(psutil.virtual_memory().total)
+        # 网络总量字符串按值缓存：空闲时计数器长时间不变，跳过重复格式化
+        self._last_totals = (-1, -1)
+        self._stats_text = ""
+        # 进度条变化不足0.5个百分点时不写回，省一次Tcl往返
+        self._last_cpu_bar = -1.0
+        self._last_mem_bar = -1.0
+
         # 创建界面
         self.create_widgets()
-        
-        # 启动监控线程
+
+        # 1Hz的采样直接由Tk自己的定时器驱动，无需独立线程与跨线程投递
         self.monitoring = True
-        self.monitor_thread = threading.Thread(target=self.monitor_system, daemon=True)
-        self.monitor_thread.start()
-        
+        self.root.after(1000, self.poll_once)
+
         # 绑定关闭事件
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
@@ -113,7 +244,7 @@ class MacSystemMonitor:
         cpu_info_frame.pack(pady=10, padx=10, fill='x')
         
         # CPU使用率标签
-        self.cpu_usage_label = ttk.Label(cpu_info_frame, text="CPU使用率: 0%", style='Value.TLabel')
+        self.cpu_usage_label = ttk.Label(cpu_info_frame, textvariable=self.cpu_usage_var, style='Value.TLabel')
         self.cpu_usage_label.pack(anchor='w')
         
         # CPU核心数
@@ -140,11 +271,11 @@ class MacSystemMonitor:
         memory_info_frame.pack(pady=10, padx=10, fill='x')
         
         # 内存使用率标签
-        self.memory_usage_label = ttk.Label(memory_info_frame, text="内存使用率: 0%", style='Value.TLabel')
+        self.memory_usage_label = ttk.Label(memory_info_frame, textvariable=self.memory_usage_var, style='Value.TLabel')
         self.memory_usage_label.pack(anchor='w')
         
         # 内存详细信息
-        self.memory_detail_label = ttk.Label(memory_info_frame, text="", style='Info.TLabel')
+        self.memory_detail_label = ttk.Label(memory_info_frame, textvariable=self.memory_detail_var, style='Info.TLabel')
         self.memory_detail_label.pack(anchor='w')
         
         # 内存进度条
@@ -164,61 +295,119 @@ class MacSystemMonitor:
         network_info_frame.pack(pady=10, padx=10, fill='x')
         
         # 网络速度标签
-        self.network_speed_label = ttk.Label(network_info_frame, text="", style='Value.TLabel')
+        self.network_speed_label = ttk.Label(network_info_frame, textvariable=self.network_speed_var, style='Value.TLabel')
         self.network_speed_label.pack(anchor='w')
         
         # 网络统计信息
-        self.network_stats_label = ttk.Label(network_info_frame, text="", style='Info.TLabel')
+        self.network_stats_label = ttk.Label(network_info_frame, textvariable=self.network_stats_var, style='Info.TLabel')
         self.network_stats_label.pack(anchor='w')
         
         # 网络图表
         self.create_network_chart(network_frame)
         
+    def _sparkline(self, buf, hi):
+        """把环形缓冲区渲染成unicode sparkline字符串"""
+        if hi <= 0:
+            hi = 1.0
+        return ''.join(_SPARK[min(8, int(v * 9 / hi))] for v in buf.values())
+
+    def _create_spark_label(self, parent, title):
+        """创建一个等宽字体的sparkline标签，返回其StringVar"""
+        frame = ttk.LabelFrame(parent, text=title, padding="10")
+        frame.pack(pady=10, padx=10, fill='both', expand=True)
+        var = tk.StringVar()
+        label = ttk.Label(frame, textvariable=var, font=('Menlo', 14))
+        label.pack(anchor='w')
+        return var
+
     def create_cpu_chart(self, parent):
         """创建CPU使用率图表"""
+        if self.chart_mode == 'spark':
+            self.cpu_spark_var = self._create_spark_label(parent, "CPU使用率趋势")
+            return
+
+        _ensure_mpl()
         chart_frame = ttk.LabelFrame(parent, text="CPU使用率趋势", padding="10")
         chart_frame.pack(pady=10, padx=10, fill='both', expand=True)
         
-        self.cpu_fig = Figure(figsize=(8, 3), dpi=100)
+        self.cpu_fig = Figure(figsize=(8, 3), dpi=72)
         self.cpu_ax = self.cpu_fig.add_subplot(111)
         self.cpu_ax.set_title("CPU使用率 (%)")
         self.cpu_ax.set_ylabel("使用率 (%)")
+        self.cpu_ax.set_xlim(0, 60)
         self.cpu_ax.set_ylim(0, 100)
+        self.cpu_ax.grid(True, alpha=0.3)
+        # 轴范围固定，关闭自动缩放避免每帧重新计算布局
+        self.cpu_ax.set_autoscale_on(False)
         self.cpu_fig.tight_layout()
-        
+
         self.cpu_canvas = FigureCanvasTkAgg(self.cpu_fig, chart_frame)
+        # 持久化的Line2D，每次更新只重绘这条线（blitting）
+        self.cpu_line, = self.cpu_ax.plot([], [], 'b-', linewidth=2, animated=True)
         self.cpu_canvas.draw()
+        self.cpu_bg = self.cpu_canvas.copy_from_bbox(self.cpu_ax.bbox)
+        self.cpu_canvas.mpl_connect('resize_event', self._on_chart_resize)
+        self.cpu_canvas.mpl_connect('draw_event', self._on_chart_draw)
         self.cpu_canvas.get_tk_widget().pack(fill='both', expand=True)
         
     def create_memory_chart(self, parent):
         """创建内存使用率图表"""
+        if self.chart_mode == 'spark':
+            self.memory_spark_var = self._create_spark_label(parent, "内存使用率趋势")
+            return
+
+        _ensure_mpl()
         chart_frame = ttk.LabelFrame(parent, text="内存使用率趋势", padding="10")
         chart_frame.pack(pady=10, padx=10, fill='both', expand=True)
         
-        self.memory_fig = Figure(figsize=(8, 3), dpi=100)
+        self.memory_fig = Figure(figsize=(8, 3), dpi=72)
         self.memory_ax = self.memory_fig.add_subplot(111)
         self.memory_ax.set_title("内存使用率 (%)")
         self.memory_ax.set_ylabel("使用率 (%)")
+        self.memory_ax.set_xlim(0, 60)
         self.memory_ax.set_ylim(0, 100)
+        self.memory_ax.grid(True, alpha=0.3)
+        # 轴范围固定，关闭自动缩放避免每帧重新计算布局
+        self.memory_ax.set_autoscale_on(False)
         self.memory_fig.tight_layout()
-        
+
         self.memory_canvas = FigureCanvasTkAgg(self.memory_fig, chart_frame)
+        self.memory_line, = self.memory_ax.plot([], [], 'g-', linewidth=2, animated=True)
         self.memory_canvas.draw()
+        self.memory_bg = self.memory_canvas.copy_from_bbox(self.memory_ax.bbox)
+        self.memory_canvas.mpl_connect('resize_event', self._on_chart_resize)
+        self.memory_canvas.mpl_connect('draw_event', self._on_chart_draw)
         self.memory_canvas.get_tk_widget().pack(fill='both', expand=True)
         
     def create_network_chart(self, parent):
         """创建网络使用率图表"""
+        if self.chart_mode == 'spark':
+            self.network_spark_var = self._create_spark_label(parent, "网络速度趋势")
+            return
+
+        _ensure_mpl()
         chart_frame = ttk.LabelFrame(parent, text="网络速度趋势", padding="10")
         chart_frame.pack(pady=10, padx=10, fill='both', expand=True)
         
-        self.network_fig = Figure(figsize=(8, 3), dpi=100)
+        self.network_fig = Figure(figsize=(8, 3), dpi=72)
         self.network_ax = self.network_fig.add_subplot(111)
         self.network_ax.set_title("网络速度 (KB/s)")
         self.network_ax.set_ylabel("速度 (KB/s)")
+        self.network_ax.set_xlim(0, 60)
+        self.network_ax.set_ylim(0, 100)
+        self.network_ax.grid(True, alpha=0.3)
+        # 轴范围固定，关闭自动缩放避免每帧重新计算布局
+        self.network_ax.set_autoscale_on(False)
         self.network_fig.tight_layout()
-        
+
         self.network_canvas = FigureCanvasTkAgg(self.network_fig, chart_frame)
+        self.network_sent_line, = self.network_ax.plot([], [], 'r-', linewidth=2, label='上传', animated=True)
+        self.network_recv_line, = self.network_ax.plot([], [], 'b-', linewidth=2, label='下载', animated=True)
+        self.network_ax.legend()
         self.network_canvas.draw()
+        self.network_bg = self.network_canvas.copy_from_bbox(self.network_ax.bbox)
+        self.network_canvas.mpl_connect('resize_event', self._on_chart_resize)
+        self.network_canvas.mpl_connect('draw_event', self._on_chart_draw)
         self.network_canvas.get_tk_widget().pack(fill='both', expand=True)
         
     def create_status_bar(self):
@@ -229,122 +418,200 @@ class MacSystemMonitor:
         self.status_label = ttk.Label(self.status_frame, text="监控中...", style='Info.TLabel')
         self.status_label.pack(side='left')
         
-        self.time_label = ttk.Label(self.status_frame, text="", style='Info.TLabel')
+        self.time_label = ttk.Label(self.status_frame, textvariable=self.time_var, style='Info.TLabel')
         self.time_label.pack(side='right')
         
     def format_bytes(self, bytes_value):
-        """格式化字节数"""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if bytes_value < 1024:
-                return f"{bytes_value:.2f} {unit}"
-            bytes_value /= 1024
-        return f"{bytes_value:.2f} TB"
-        
-    def monitor_system(self):
-        """系统监控主循环"""
-        while self.monitoring:
-            try:
-                # 获取CPU使用率
-                cpu_percent = psutil.cpu_percent(interval=1)
-                self.cpu_data.append(cpu_percent)
-                
-                # 获取内存信息
-                memory = psutil.virtual_memory()
-                memory_percent = memory.percent
-                self.memory_data.append(memory_percent)
-                
-                # 获取网络信息
-                current_network = psutil.net_io_counters()
-                current_time = time.time()
-                time_delta = current_time - self.last_network_time
-                
-                if time_delta > 0:
-                    sent_speed = (current_network.bytes_sent - self.network_stats_base.bytes_sent) / time_delta / 1024  # KB/s
-                    recv_speed = (current_network.bytes_recv - self.network_stats_base.bytes_recv) / time_delta / 1024  # KB/s
-                    
-                    self.network_sent_data.append(sent_speed)
-                    self.network_recv_data.append(recv_speed)
-                    
-                    self.network_stats_base = current_network
-                    self.last_network_time = current_time
-                
-                # 更新界面
-                self.root.after(0, self.update_ui, cpu_percent, memory, sent_speed if 'sent_speed' in locals() else 0, recv_speed if 'recv_speed' in locals() else 0)
-                
-            except Exception as e:
-                print(f"监控错误: {e}")
-                
-            time.sleep(1)
-            
-    def update_ui(self, cpu_percent, memory, sent_speed, recv_speed):
+        """格式化字节数（bit_length直接定位单位，免循环除法）"""
+        if bytes_value < 1:
+            return _ZERO_BYTES
+        exp = min((int(bytes_value).bit_length() - 1) // 10, len(BYTE_UNITS) - 1)
+        return f"{bytes_value / (1 << (exp * 10)):.2f} {BYTE_UNITS[exp]}"
+        
+    def poll_once(self):
+        """采样一次并刷新界面，然后用Tk定时器重新排程自己"""
+        try:
+            # 获取CPU使用率（非阻塞，取自上次调用以来的增量；
+            # 瞬时失败时沿用上一个采样点保持曲线连续）
+            cpu_percent = _safe(lambda: psutil.cpu_percent(interval=None),
+                                default=self.cpu_data.last())
+            self.cpu_data.append(cpu_percent)
+
+            # 获取内存信息
+            memory = _safe(psutil.virtual_memory)
+            if memory is None:
+                raise OSError("virtual_memory 采样失败")
+            memory_percent = memory.percent
+            self.memory_data.append(memory_percent)
+
+            # 获取网络信息（每tick只查询一次接口计数器）
+            current_network = _safe(lambda: psutil.net_io_counters(pernic=False, nowrap=False))
+            if current_network is None:
+                raise OSError("net_io_counters 采样失败")
+            current_time = time.time()
+            time_delta = current_time - self.last_network_time
+
+            sent_speed = 0.0
+            recv_speed = 0.0
+            total_sent = current_network.bytes_sent
+            total_recv = current_network.bytes_recv
+            if time_delta > 0:
+                sent_speed = (total_sent - self._prev_sent) / time_delta / 1024  # KB/s
+                recv_speed = (total_recv - self._prev_recv) / time_delta / 1024  # KB/s
+
+                self.network_sent_data.append(sent_speed)
+                self.network_recv_data.append(recv_speed)
+
+                self._prev_sent = total_sent
+                self._prev_recv = total_recv
+                self.last_network_time = current_time
+
+            self._snapshot = Snapshot(
+                cpu_percent=cpu_percent,
+                memory=memory,
+                sent_speed=sent_speed,
+                recv_speed=recv_speed,
+                total_sent=total_sent,
+                total_recv=total_recv,
+                timestamp=current_time,
+            )
+            self.sample_buf.append(self._snapshot)
+            self.update_ui(self._snapshot)
+
+        except Exception as e:
+            print(f"监控错误: {e}")
+
+        if self.monitoring:
+            self.root.after(1000, self.poll_once)
+
+    def update_ui(self, snap):
         """更新用户界面"""
         try:
+            memory = snap.memory
+            format_bytes = self.format_bytes
+
             # 更新CPU信息
-            self.cpu_usage_label.config(text=f"CPU使用率: {cpu_percent:.1f}%")
-            self.cpu_progress['value'] = cpu_percent
-            
+            self.cpu_usage_var.set(f"CPU使用率: {snap.cpu_percent:.1f}%")
+            if abs(snap.cpu_percent - self._last_cpu_bar) >= 0.5:
+                self.cpu_progress['value'] = snap.cpu_percent
+                self._last_cpu_bar = snap.cpu_percent
+
             # 更新内存信息
-            self.memory_usage_label.config(text=f"内存使用率: {memory.percent:.1f}%")
-            memory_detail = f"总内存: {self.format_bytes(memory.total)}    "
-            memory_detail += f"已使用: {self.format_bytes(memory.used)}    "
-            memory_detail += f"可用: {self.format_bytes(memory.available)}"
-            self.memory_detail_label.config(text=memory_detail)
-            self.memory_progress['value'] = memory.percent
-            
+            self.memory_usage_var.set(f"内存使用率: {memory.percent:.1f}%")
+            memory_detail = f"总内存: {self._mem_total_str}    "
+            memory_detail += f"已使用: {format_bytes(memory.used)}    "
+            memory_detail += f"可用: {format_bytes(memory.available)}"
+            self.memory_detail_var.set(memory_detail)
+            if abs(memory.percent - self._last_mem_bar) >= 0.5:
+                self.memory_progress['value'] = memory.percent
+                self._last_mem_bar = memory.percent
+
             # 更新网络信息
-            network_text = f"上传速度: {sent_speed:.2f} KB/s    下载速度: {recv_speed:.2f} KB/s"
-            self.network_speed_label.config(text=network_text)
-            
-            # 更新网络统计
-            net_stats = psutil.net_io_counters()
-            stats_text = f"总发送: {self.format_bytes(net_stats.bytes_sent)}    "
-            stats_text += f"总接收: {self.format_bytes(net_stats.bytes_recv)}"
-            self.network_stats_label.config(text=stats_text)
-            
+            self.network_speed_var.set(
+                f"上传速度: {snap.sent_speed:.2f} KB/s    下载速度: {snap.recv_speed:.2f} KB/s")
+
+            # 更新网络统计（复用采样得到的计数器，避免重复查询；
+            # 计数器没有变化时直接复用上次的格式化结果）
+            totals = (snap.total_sent, snap.total_recv)
+            if totals != self._last_totals:
+                self._stats_text = (f"总发送: {format_bytes(snap.total_sent)}    "
+                                    f"总接收: {format_bytes(snap.total_recv)}")
+                self._last_totals = totals
+            self.network_stats_var.set(self._stats_text)
+
             # 更新时间
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.time_label.config(text=f"更新时间: {current_time}")
+            self.time_var.set(f"更新时间: {current_time}")
             
-            # 更新图表
-            self.update_charts()
+            # 更新图表（按stride节流，标签保持每秒更新）
+            self._tick += 1
+            if self._tick % self.chart_stride == 0:
+                self.update_charts()
+
+            # 一批StringVar更新后主动处理挂起的几何/重绘事件
+            self.root.update_idletasks()
             
         except Exception as e:
             print(f"界面更新错误: {e}")
             
+    def _on_chart_resize(self, event):
+        """窗口尺寸变化后已缓存的背景失效，标记下次更新时重新捕获"""
+        self._charts_dirty = True
+
+    def _on_chart_draw(self, event):
+        """任何一次完整重绘后刷新对应画布的背景缓存（blitting的底图）"""
+        canvas = event.canvas
+        if canvas is getattr(self, 'cpu_canvas', None):
+            self.cpu_bg = canvas.copy_from_bbox(self.cpu_ax.bbox)
+        elif canvas is getattr(self, 'memory_canvas', None):
+            self.memory_bg = canvas.copy_from_bbox(self.memory_ax.bbox)
+        elif canvas is getattr(self, 'network_canvas', None):
+            self.network_bg = canvas.copy_from_bbox(self.network_ax.bbox)
+
+    def _recapture_backgrounds(self):
+        """请求空闲时重绘空白图表，背景缓存由draw_event回调刷新"""
+        # draw_idle会把排队的多次重绘合并为一次，避免阻塞Tk事件循环
+        self.cpu_canvas.draw_idle()
+        self.memory_canvas.draw_idle()
+        self.network_canvas.draw_idle()
+        self._charts_dirty = False
+
+    def _blit_chart(self, canvas, ax, background, lines_and_data):
+        """恢复缓存背景后只重绘数据线，避免整图重新栅格化"""
+        canvas.restore_region(background)
+        for line, data in lines_and_data:
+            line.set_data(self._x[:len(data)], data)
+            ax.draw_artist(line)
+        canvas.blit(ax.bbox)
+
     def update_charts(self):
         """更新图表"""
         try:
+            # 热循环里反复访问的属性先绑定到局部变量（LOAD_FAST比LOAD_ATTR快）
+            cpu_data = self.cpu_data
+            memory_data = self.memory_data
+            sent_data = self.network_sent_data
+            recv_data = self.network_recv_data
+
+            if self.chart_mode == 'spark':
+                # 三条sparkline各是一次字符串拼接+一次Label赋值
+                sparkline = self._sparkline
+                self.cpu_spark_var.set(sparkline(cpu_data, 100))
+                self.memory_spark_var.set(sparkline(memory_data, 100))
+                peak = max(sent_data.max(), recv_data.max())
+                self.network_spark_var.set(
+                    "↑ " + sparkline(sent_data, peak) + "\n" +
+                    "↓ " + sparkline(recv_data, peak))
+                return
+
+            if self._charts_dirty:
+                self._recapture_backgrounds()
+
+            blit = self._blit_chart
+
             # 更新CPU图表
-            if len(self.cpu_data) > 1:
-                self.cpu_ax.clear()
-                self.cpu_ax.plot(list(self.cpu_data), 'b-', linewidth=2)
-                self.cpu_ax.set_title("CPU使用率 (%)")
-                self.cpu_ax.set_ylabel("使用率 (%)")
-                self.cpu_ax.set_ylim(0, 100)
-                self.cpu_ax.grid(True, alpha=0.3)
-                self.cpu_canvas.draw()
-            
+            if len(cpu_data) > 1:
+                blit(self.cpu_canvas, self.cpu_ax, self.cpu_bg,
+                     [(self.cpu_line, cpu_data.values())])
+
             # 更新内存图表
-            if len(self.memory_data) > 1:
-                self.memory_ax.clear()
-                self.memory_ax.plot(list(self.memory_data), 'g-', linewidth=2)
-                self.memory_ax.set_title("内存使用率 (%)")
-                self.memory_ax.set_ylabel("使用率 (%)")
-                self.memory_ax.set_ylim(0, 100)
-                self.memory_ax.grid(True, alpha=0.3)
-                self.memory_canvas.draw()
-            
+            if len(memory_data) > 1:
+                blit(self.memory_canvas, self.memory_ax, self.memory_bg,
+                     [(self.memory_line, memory_data.values())])
+
             # 更新网络图表
-            if len(self.network_sent_data) > 1 and len(self.network_recv_data) > 1:
-                self.network_ax.clear()
-                self.network_ax.plot(list(self.network_sent_data), 'r-', linewidth=2, label='上传')
-                self.network_ax.plot(list(self.network_recv_data), 'b-', linewidth=2, label='下载')
-                self.network_ax.set_title("网络速度 (KB/s)")
-                self.network_ax.set_ylabel("速度 (KB/s)")
-                self.network_ax.legend()
-                self.network_ax.grid(True, alpha=0.3)
-                self.network_canvas.draw()
-                
+            if len(sent_data) > 1 and len(recv_data) > 1:
+                # 网速没有固定上限，超出当前量程时扩大ylim并重建背景
+                peak = max(sent_data.max(), recv_data.max())
+                if peak > self.network_ax.get_ylim()[1]:
+                    # 量程变化需要整图重绘，交给空闲重绘合并，下个tick恢复blit
+                    self.network_ax.set_ylim(0, peak * 1.2)
+                    self.network_canvas.draw_idle()
+                else:
+                    blit(self.network_canvas, self.network_ax, self.network_bg,
+                         [(self.network_sent_line, sent_data.values()),
+                          (self.network_recv_line, recv_data.values())])
+
         except Exception as e:
             print(f"图表更新错误: {e}")
             
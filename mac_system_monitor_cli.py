@@ -5,52 +5,63 @@ Mac系统监控应用程序 - 命令行版本
 """
 
 import psutil
+import sys
 import time
 import os
 import platform
 from datetime import datetime
 
+BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+# 空闲时大量字段是0，返回共享常量避免每次格式化新建字符串
+_ZERO_BYTES = "0.00 B"
+
+# 进程生命周期内不变的系统信息，导入时查询一次，避免每次刷新重复系统调用
+_UNAME = platform.uname()
+_BOOT_TIME = datetime.fromtimestamp(psutil.boot_time()).strftime('%Y-%m-%d %H:%M:%S')
+_CPU_PHYSICAL = psutil.cpu_count(logical=False)
+_CPU_LOGICAL = psutil.cpu_count(logical=True)
+
 
 class MacSystemMonitorCLI:
     def __init__(self):
         self.network_stats_base = psutil.net_io_counters()
         self.last_network_time = time.time()
+        # 默认宽度下41种可能的进度条预先生成，热路径只做索引
+        self._bars = tuple('█' * i + '░' * (40 - i) for i in range(41))
         
     def clear_screen(self):
-        """清屏"""
-        os.system('clear' if os.name == 'posix' else 'cls')
+        """清屏（ANSI光标归位+清屏，避免每次刷新都fork一个子进程）"""
+        if os.name == 'posix':
+            sys.stdout.write('\x1b[H\x1b[2J')
+            sys.stdout.flush()
+        else:
+            os.system('cls')
         
     def format_bytes(self, bytes_value):
-        """格式化字节数"""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if bytes_value < 1024:
-                return f"{bytes_value:.2f} {unit}"
-            bytes_value /= 1024
-        return f"{bytes_value:.2f} TB"
+        """格式化字节数（bit_length直接定位单位，免循环除法）"""
+        if bytes_value < 1:
+            return _ZERO_BYTES
+        exp = min((int(bytes_value).bit_length() - 1) // 10, len(BYTE_UNITS) - 1)
+        return f"{bytes_value / (1 << (exp * 10)):.2f} {BYTE_UNITS[exp]}"
         
     def get_system_info(self):
-        """获取系统信息"""
-        system_info = platform.uname()
-        boot_time = datetime.fromtimestamp(psutil.boot_time())
-        
+        """获取系统信息（静态部分取模块级缓存）"""
         return {
-            'system': f"{system_info.system} {system_info.release}",
-            'machine': system_info.machine,
-            'boot_time': boot_time.strftime('%Y-%m-%d %H:%M:%S'),
-            'hostname': system_info.node
+            'system': f"{_UNAME.system} {_UNAME.release}",
+            'machine': _UNAME.machine,
+            'boot_time': _BOOT_TIME,
+            'hostname': _UNAME.node
         }
-        
+
     def get_cpu_info(self):
-        """获取CPU信息"""
+        """获取CPU信息（核心数取模块级缓存，只有使用率和频率每次采样）"""
         cpu_percent = psutil.cpu_percent(interval=1)
-        cpu_count_physical = psutil.cpu_count(logical=False)
-        cpu_count_logical = psutil.cpu_count(logical=True)
         cpu_freq = psutil.cpu_freq()
-        
+
         return {
             'usage_percent': cpu_percent,
-            'physical_cores': cpu_count_physical,
-            'logical_cores': cpu_count_logical,
+            'physical_cores': _CPU_PHYSICAL,
+            'logical_cores': _CPU_LOGICAL,
             'frequency': cpu_freq.current if cpu_freq else 0
         }
         
@@ -113,88 +124,92 @@ class MacSystemMonitorCLI:
     def create_progress_bar(self, percent, width=40):
         """创建进度条"""
         filled = int(width * percent / 100)
-        bar = '█' * filled + '░' * (width - filled)
+        if width == 40:
+            bar = self._bars[min(filled, 40)]
+        else:
+            bar = '█' * filled + '░' * (width - filled)
         return f"[{bar}] {percent:.1f}%"
         
-    def display_system_info(self, info):
+    def display_system_info(self, info, buf):
         """显示系统信息"""
-        print("=" * 80)
-        print("🖥️  MAC系统监控器")
-        print("=" * 80)
-        print(f"系统: {info['system']}")
-        print(f"主机名: {info['hostname']}")
-        print(f"处理器: {info['machine']}")
-        print(f"启动时间: {info['boot_time']}")
-        print(f"当前时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print()
-        
-    def display_cpu_info(self, info):
+        buf.append("=" * 80)
+        buf.append("🖥️  MAC系统监控器")
+        buf.append("=" * 80)
+        buf.append(f"系统: {info['system']}")
+        buf.append(f"主机名: {info['hostname']}")
+        buf.append(f"处理器: {info['machine']}")
+        buf.append(f"启动时间: {info['boot_time']}")
+        buf.append(f"当前时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        buf.append("")
+
+    def display_cpu_info(self, info, buf):
         """显示CPU信息"""
-        print("🔥 CPU使用情况")
-        print("-" * 40)
-        print(f"使用率: {self.create_progress_bar(info['usage_percent'])}")
-        print(f"物理核心: {info['physical_cores']} 个")
-        print(f"逻辑核心: {info['logical_cores']} 个")
+        buf.append("🔥 CPU使用情况")
+        buf.append("-" * 40)
+        buf.append(f"使用率: {self.create_progress_bar(info['usage_percent'])}")
+        buf.append(f"物理核心: {info['physical_cores']} 个")
+        buf.append(f"逻辑核心: {info['logical_cores']} 个")
         if info['frequency'] > 0:
-            print(f"当前频率: {info['frequency']:.1f} MHz")
-        print()
-        
-    def display_memory_info(self, info):
+            buf.append(f"当前频率: {info['frequency']:.1f} MHz")
+        buf.append("")
+
+    def display_memory_info(self, info, buf):
         """显示内存信息"""
-        print("💾 内存使用情况")
-        print("-" * 40)
-        print(f"使用率: {self.create_progress_bar(info['percent'])}")
-        print(f"总内存: {self.format_bytes(info['total'])}")
-        print(f"已使用: {self.format_bytes(info['used'])}")
-        print(f"可用: {self.format_bytes(info['available'])}")
-        
+        buf.append("💾 内存使用情况")
+        buf.append("-" * 40)
+        buf.append(f"使用率: {self.create_progress_bar(info['percent'])}")
+        buf.append(f"总内存: {self.format_bytes(info['total'])}")
+        buf.append(f"已使用: {self.format_bytes(info['used'])}")
+        buf.append(f"可用: {self.format_bytes(info['available'])}")
+
         if info['swap_total'] > 0:
-            print(f"交换分区: {self.create_progress_bar(info['swap_percent'])}")
-            print(f"交换总量: {self.format_bytes(info['swap_total'])}")
-            print(f"交换使用: {self.format_bytes(info['swap_used'])}")
-        print()
-        
-    def display_network_info(self, info):
+            buf.append(f"交换分区: {self.create_progress_bar(info['swap_percent'])}")
+            buf.append(f"交换总量: {self.format_bytes(info['swap_total'])}")
+            buf.append(f"交换使用: {self.format_bytes(info['swap_used'])}")
+        buf.append("")
+
+    def display_network_info(self, info, buf):
         """显示网络信息"""
-        print("🌐 网络使用情况")
-        print("-" * 40)
-        print(f"上传速度: {self.format_bytes(info['sent_speed'])}/s")
-        print(f"下载速度: {self.format_bytes(info['recv_speed'])}/s")
-        print(f"总发送: {self.format_bytes(info['total_sent'])}")
-        print(f"总接收: {self.format_bytes(info['total_recv'])}")
-        print(f"发送包数: {info['packets_sent']:,}")
-        print(f"接收包数: {info['packets_recv']:,}")
-        print()
-        
-    def display_disk_info(self, info):
+        buf.append("🌐 网络使用情况")
+        buf.append("-" * 40)
+        buf.append(f"上传速度: {self.format_bytes(info['sent_speed'])}/s")
+        buf.append(f"下载速度: {self.format_bytes(info['recv_speed'])}/s")
+        buf.append(f"总发送: {self.format_bytes(info['total_sent'])}")
+        buf.append(f"总接收: {self.format_bytes(info['total_recv'])}")
+        buf.append(f"发送包数: {info['packets_sent']:,}")
+        buf.append(f"接收包数: {info['packets_recv']:,}")
+        buf.append("")
+
+    def display_disk_info(self, info, buf):
         """显示磁盘信息"""
-        print("💽 磁盘使用情况")
-        print("-" * 40)
-        print(f"使用率: {self.create_progress_bar(info['percent'])}")
-        print(f"总容量: {self.format_bytes(info['total'])}")
-        print(f"已使用: {self.format_bytes(info['used'])}")
-        print(f"可用: {self.format_bytes(info['free'])}")
-        print()
-        
+        buf.append("💽 磁盘使用情况")
+        buf.append("-" * 40)
+        buf.append(f"使用率: {self.create_progress_bar(info['percent'])}")
+        buf.append(f"总容量: {self.format_bytes(info['total'])}")
+        buf.append(f"已使用: {self.format_bytes(info['used'])}")
+        buf.append(f"可用: {self.format_bytes(info['free'])}")
+        buf.append("")
+
     def run_once(self):
         """运行一次监控"""
-        self.clear_screen()
-        
         # 获取所有信息
         system_info = self.get_system_info()
         cpu_info = self.get_cpu_info()
         memory_info = self.get_memory_info()
         network_info = self.get_network_info()
         disk_info = self.get_disk_info()
-        
-        # 显示信息
-        self.display_system_info(system_info)
-        self.display_cpu_info(cpu_info)
-        self.display_memory_info(memory_info)
-        self.display_network_info(network_info)
-        self.display_disk_info(disk_info)
-        
-        print("按 Ctrl+C 退出监控")
+
+        # 整帧先拼好再一次性写出，消除逐行print造成的撕裂和多次系统调用
+        buf = ['\x1b[H\x1b[2J']
+        self.display_system_info(system_info, buf)
+        self.display_cpu_info(cpu_info, buf)
+        self.display_memory_info(memory_info, buf)
+        self.display_network_info(network_info, buf)
+        self.display_disk_info(disk_info, buf)
+        buf.append("按 Ctrl+C 退出监控")
+
+        sys.stdout.write(buf[0] + '\n'.join(buf[1:]) + '\n')
+        sys.stdout.flush()
         
     def run(self, refresh_interval=2):
         """运行监控循环"""
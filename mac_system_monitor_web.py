@@ -4,162 +4,32 @@ Mac系统监控应用程序 - Web版本
 监控CPU、内存和网络使用情况
 """
 
-from flask import Flask, render_template, jsonify
+from flask import Flask, Response, jsonify, request
+import hashlib
 import psutil
+import threading
 import time
 import platform
 from datetime import datetime
-import json
+import orjson
 
 
 app = Flask(__name__)
 
-class SystemMonitor:
-    def __init__(self):
-        self.network_stats_base = psutil.net_io_counters()
-        self.last_network_time = time.time()
-        
-    def format_bytes(self, bytes_value):
-        """格式化字节数"""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if bytes_value < 1024:
-                return f"{bytes_value:.2f} {unit}"
-            bytes_value /= 1024
-        return f"{bytes_value:.2f} TB"
-        
-    def get_system_info(self):
-        """获取系统信息"""
-        system_info = platform.uname()
-        boot_time = datetime.fromtimestamp(psutil.boot_time())
-        
-        return {
-            'system': f"{system_info.system} {system_info.release}",
-            'machine': system_info.machine,
-            'boot_time': boot_time.strftime('%Y-%m-%d %H:%M:%S'),
-            'hostname': system_info.node,
-            'current_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
-        
-    def get_cpu_info(self):
-        """获取CPU信息"""
-        cpu_percent = psutil.cpu_percent(interval=1)
-        cpu_count_physical = psutil.cpu_count(logical=False)
-        cpu_count_logical = psutil.cpu_count(logical=True)
-        cpu_freq = psutil.cpu_freq()
-        
-        return {
-            'usage_percent': round(cpu_percent, 1),
-            'physical_cores': cpu_count_physical,
-            'logical_cores': cpu_count_logical,
-            'frequency': round(cpu_freq.current, 1) if cpu_freq else 0
-        }
-        
-    def get_memory_info(self):
-        """获取内存信息"""
-        memory = psutil.virtual_memory()
-        swap = psutil.swap_memory()
-        
-        return {
-            'total': memory.total,
-            'total_formatted': self.format_bytes(memory.total),
-            'available': memory.available,
-            'available_formatted': self.format_bytes(memory.available),
-            'used': memory.used,
-            'used_formatted': self.format_bytes(memory.used),
-            'percent': round(memory.percent, 1),
-            'swap_total': swap.total,
-            'swap_total_formatted': self.format_bytes(swap.total),
-            'swap_used': swap.used,
-            'swap_used_formatted': self.format_bytes(swap.used),
-            'swap_percent': round(swap.percent, 1) if swap.total > 0 else 0
-        }
-        
-    def get_network_info(self):
-        """获取网络信息"""
-        current_network = psutil.net_io_counters()
-        current_time = time.time()
-        time_delta = current_time - self.last_network_time
-        
-        if time_delta > 0:
-            sent_speed = (current_network.bytes_sent - self.network_stats_base.bytes_sent) / time_delta
-            recv_speed = (current_network.bytes_recv - self.network_stats_base.bytes_recv) / time_delta
-            
-            self.network_stats_base = current_network
-            self.last_network_time = current_time
-            
-            return {
-                'sent_speed': sent_speed,
-                'sent_speed_formatted': self.format_bytes(sent_speed) + '/s',
-                'recv_speed': recv_speed,
-                'recv_speed_formatted': self.format_bytes(recv_speed) + '/s',
-                'total_sent': current_network.bytes_sent,
-                'total_sent_formatted': self.format_bytes(current_network.bytes_sent),
-                'total_recv': current_network.bytes_recv,
-                'total_recv_formatted': self.format_bytes(current_network.bytes_recv),
-                'packets_sent': current_network.packets_sent,
-                'packets_recv': current_network.packets_recv
-            }
-        
-        return {
-            'sent_speed': 0,
-            'sent_speed_formatted': '0 B/s',
-            'recv_speed': 0,
-            'recv_speed_formatted': '0 B/s',
-            'total_sent': current_network.bytes_sent,
-            'total_sent_formatted': self.format_bytes(current_network.bytes_sent),
-            'total_recv': current_network.bytes_recv,
-            'total_recv_formatted': self.format_bytes(current_network.bytes_recv),
-            'packets_sent': current_network.packets_sent,
-            'packets_recv': current_network.packets_recv
-        }
-        
-    def get_disk_info(self):
-        """获取磁盘信息"""
-        disk_usage = psutil.disk_usage('/')
-        return {
-            'total': disk_usage.total,
-            'total_formatted': self.format_bytes(disk_usage.total),
-            'used': disk_usage.used,
-            'used_formatted': self.format_bytes(disk_usage.used),
-            'free': disk_usage.free,
-            'free_formatted': self.format_bytes(disk_usage.free),
-            'percent': round((disk_usage.used / disk_usage.total) * 100, 1)
-        }
-        
-    def get_all_info(self):
-        """获取所有系统信息"""
-        return {
-            'system': self.get_system_info(),
-            'cpu': self.get_cpu_info(),
-            'memory': self.get_memory_info(),
-            'network': self.get_network_info(),
-            'disk': self.get_disk_info()
-        }
-
-# 创建监控器实例
-monitor = SystemMonitor()
+# JSON响应2-3KB的中文文本gzip后不到1KB，有flask-compress就启用
+try:
+    from flask_compress import Compress
+    Compress(app)
+except ImportError:
+    pass
 
-@app.route('/')
-def index():
-    """主页面"""
-    return render_template('monitor.html')
-
-@app.route('/api/system')
-def api_system():
-    """获取系统信息API"""
-    try:
-        data = monitor.get_all_info()
-        return jsonify(data)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+_DIVISORS = tuple(1 << (10 * i) for i in range(len(_UNITS)))
+# 空闲系统上大量字段是0，常量直接返回，不走格式化也不产生新字符串
+_ZERO_BYTES = "0.00 B"
 
-if __name__ == '__main__':
-    # 创建模板目录和文件
-    import os
-    os.makedirs('templates', exist_ok=True)
-    
-    # 创建HTML模板
-    html_template = '''<!DOCTYPE html>
+# 页面是纯静态HTML（无Jinja变量），常驻内存直接返回，省去模板引擎参与
+_MONITOR_HTML = '''<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
@@ -342,174 +212,124 @@ if __name__ == '__main__':
         function formatNumber(num) {
             return num.toLocaleString();
         }
-        
+
         function getProgressBarClass(percent) {
             if (percent >= 80) return 'danger';
             if (percent >= 60) return 'warning';
             return '';
         }
-        
-        function updateSystemInfo(data) {
-            const container = document.getElementById('system-info');
-            container.innerHTML = `
+
+        // 首帧构建DOM并缓存所有值节点引用，之后只写textContent和进度条宽度，
+        // 避免整卡innerHTML替换引发的HTML重解析、节点重建和布局重排
+        const refs = {};
+        let cardsBuilt = false;
+
+        function infoItem(label, refKey) {
+            return `<div class="info-item">
+                <span class="info-label">${label}</span>
+                <span class="info-value" data-ref="${refKey}"></span>
+            </div>`;
+        }
+
+        function buildCards(data) {
+            document.getElementById('system-info').innerHTML = `
                 <h2><span class="icon">ℹ️</span>系统信息</h2>
                 <div class="info-grid">
-                    <div class="info-item">
-                        <span class="info-label">系统</span>
-                        <span class="info-value">${data.system}</span>
-                    </div>
-                    <div class="info-item">
-                        <span class="info-label">主机名</span>
-                        <span class="info-value">${data.hostname}</span>
-                    </div>
-                    <div class="info-item">
-                        <span class="info-label">处理器</span>
-                        <span class="info-value">${data.machine}</span>
-                    </div>
-                    <div class="info-item">
-                        <span class="info-label">启动时间</span>
-                        <span class="info-value">${data.boot_time}</span>
-                    </div>
-                    <div class="info-item">
-                        <span class="info-label">当前时间</span>
-                        <span class="info-value">${data.current_time}</span>
-                    </div>
-                </div>
-            `;
-        }
-        
-        function updateCPUInfo(data) {
-            const container = document.getElementById('cpu-info');
-            container.innerHTML = `
+                    ${infoItem('系统', 'sys.system')}
+                    ${infoItem('主机名', 'sys.hostname')}
+                    ${infoItem('处理器', 'sys.machine')}
+                    ${infoItem('启动时间', 'sys.boot_time')}
+                    ${infoItem('当前时间', 'sys.current_time')}
+                </div>`;
+            document.getElementById('cpu-info').innerHTML = `
                 <h2><span class="icon">🔥</span>CPU使用情况</h2>
-                <div class="progress-bar">
-                    <div class="progress-fill ${getProgressBarClass(data.usage_percent)}" 
-                         style="width: ${data.usage_percent}%"></div>
-                </div>
+                <div class="progress-bar"><div class="progress-fill" data-ref="cpu.bar"></div></div>
                 <div class="info-grid">
-                    <div class="info-item">
-                        <span class="info-label">使用率</span>
-                        <span class="info-value">${data.usage_percent}%</span>
-                    </div>
-                    <div class="info-item">
-                        <span class="info-label">物理核心</span>
-                        <span class="info-value">${data.physical_cores} 个</span>
-                    </div>
-                    <div class="info-item">
-                        <span class="info-label">逻辑核心</span>
-                        <span class="info-value">${data.logical_cores} 个</span>
-                    </div>
-                    ${data.frequency > 0 ? `
-                    <div class="info-item">
-                        <span class="info-label">频率</span>
-                        <span class="info-value">${data.frequency} MHz</span>
-                    </div>
-                    ` : ''}
-                </div>
-            `;
-        }
-        
-        function updateMemoryInfo(data) {
-            const container = document.getElementById('memory-info');
-            container.innerHTML = `
+                    ${infoItem('使用率', 'cpu.percent')}
+                    ${infoItem('物理核心', 'cpu.physical')}
+                    ${infoItem('逻辑核心', 'cpu.logical')}
+                    ${data.cpu.frequency > 0 ? infoItem('频率', 'cpu.freq') : ''}
+                </div>`;
+            document.getElementById('memory-info').innerHTML = `
                 <h2><span class="icon">💾</span>内存使用情况</h2>
-                <div class="progress-bar">
-                    <div class="progress-fill ${getProgressBarClass(data.percent)}" 
-                         style="width: ${data.percent}%"></div>
-                </div>
+                <div class="progress-bar"><div class="progress-fill" data-ref="mem.bar"></div></div>
                 <div class="info-grid">
-                    <div class="info-item">
-                        <span class="info-label">使用率</span>
-                        <span class="info-value">${data.percent}%</span>
-                    </div>
-                    <div class="info-item">
-                        <span class="info-label">总内存</span>
-                        <span class="info-value">${data.total_formatted}</span>
-                    </div>
-                    <div class="info-item">
-                        <span class="info-label">已使用</span>
-                        <span class="info-value">${data.used_formatted}</span>
-                    </div>
-                    <div class="info-item">
-                        <span class="info-label">可用</span>
-                        <span class="info-value">${data.available_formatted}</span>
-                    </div>
-                    ${data.swap_total > 0 ? `
-                    <div class="info-item">
-                        <span class="info-label">交换分区</span>
-                        <span class="info-value">${data.swap_percent}%</span>
-                    </div>
-                    <div class="info-item">
-                        <span class="info-label">交换总量</span>
-                        <span class="info-value">${data.swap_total_formatted}</span>
-                    </div>
-                    ` : ''}
-                </div>
-            `;
-        }
-        
-        function updateNetworkInfo(data) {
-            const container = document.getElementById('network-info');
-            container.innerHTML = `
+                    ${infoItem('使用率', 'mem.percent')}
+                    ${infoItem('总内存', 'mem.total')}
+                    ${infoItem('已使用', 'mem.used')}
+                    ${infoItem('可用', 'mem.available')}
+                    ${data.memory.swap_total > 0 ? infoItem('交换分区', 'mem.swapPercent') + infoItem('交换总量', 'mem.swapTotal') : ''}
+                </div>`;
+            document.getElementById('network-info').innerHTML = `
                 <h2><span class="icon">🌐</span>网络使用情况</h2>
                 <div class="info-grid">
-                    <div class="info-item">
-                        <span class="info-label">上传速度</span>
-                        <span class="info-value">${data.sent_speed_formatted}</span>
-                    </div>
-                    <div class="info-item">
-                        <span class="info-label">下载速度</span>
-                        <span class="info-value">${data.recv_speed_formatted}</span>
-                    </div>
-                    <div class="info-item">
-                        <span class="info-label">总发送</span>
-                        <span class="info-value">${data.total_sent_formatted}</span>
-                    </div>
-                    <div class="info-item">
-                        <span class="info-label">总接收</span>
-                        <span class="info-value">${data.total_recv_formatted}</span>
-                    </div>
-                    <div class="info-item">
-                        <span class="info-label">发送包数</span>
-                        <span class="info-value">${formatNumber(data.packets_sent)}</span>
-                    </div>
-                    <div class="info-item">
-                        <span class="info-label">接收包数</span>
-                        <span class="info-value">${formatNumber(data.packets_recv)}</span>
-                    </div>
-                </div>
-            `;
-        }
-        
-        function updateDiskInfo(data) {
-            const container = document.getElementById('disk-info');
-            container.innerHTML = `
+                    ${infoItem('上传速度', 'net.sent')}
+                    ${infoItem('下载速度', 'net.recv')}
+                    ${infoItem('总发送', 'net.totalSent')}
+                    ${infoItem('总接收', 'net.totalRecv')}
+                    ${infoItem('发送包数', 'net.packetsSent')}
+                    ${infoItem('接收包数', 'net.packetsRecv')}
+                </div>`;
+            document.getElementById('disk-info').innerHTML = `
                 <h2><span class="icon">💽</span>磁盘使用情况</h2>
-                <div class="progress-bar">
-                    <div class="progress-fill ${getProgressBarClass(data.percent)}" 
-                         style="width: ${data.percent}%"></div>
-                </div>
+                <div class="progress-bar"><div class="progress-fill" data-ref="disk.bar"></div></div>
                 <div class="info-grid">
-                    <div class="info-item">
-                        <span class="info-label">使用率</span>
-                        <span class="info-value">${data.percent}%</span>
-                    </div>
-                    <div class="info-item">
-                        <span class="info-label">总容量</span>
-                        <span class="info-value">${data.total_formatted}</span>
-                    </div>
-                    <div class="info-item">
-                        <span class="info-label">已使用</span>
-                        <span class="info-value">${data.used_formatted}</span>
-                    </div>
-                    <div class="info-item">
-                        <span class="info-label">可用</span>
-                        <span class="info-value">${data.free_formatted}</span>
-                    </div>
-                </div>
-            `;
+                    ${infoItem('使用率', 'disk.percent')}
+                    ${infoItem('总容量', 'disk.total')}
+                    ${infoItem('已使用', 'disk.used')}
+                    ${infoItem('可用', 'disk.free')}
+                </div>`;
+            document.querySelectorAll('[data-ref]').forEach(el => { refs[el.dataset.ref] = el; });
         }
-        
+
+        function setText(key, value) {
+            const el = refs[key];
+            // 值没变时不写DOM，浏览器可以完全跳过样式/布局计算
+            if (el && el.textContent !== value) el.textContent = value;
+        }
+
+        function setBar(key, percent) {
+            const el = refs[key];
+            if (!el) return;
+            el.style.width = percent + '%';
+            el.className = 'progress-fill ' + getProgressBarClass(percent);
+        }
+
+        function render(data) {
+            setText('sys.system', data.system.system);
+            setText('sys.hostname', data.system.hostname);
+            setText('sys.machine', data.system.machine);
+            setText('sys.boot_time', data.system.boot_time);
+            setText('sys.current_time', data.system.current_time);
+
+            setBar('cpu.bar', data.cpu.usage_percent);
+            setText('cpu.percent', data.cpu.usage_percent + '%');
+            setText('cpu.physical', data.cpu.physical_cores + ' 个');
+            setText('cpu.logical', data.cpu.logical_cores + ' 个');
+            setText('cpu.freq', data.cpu.frequency + ' MHz');
+
+            setBar('mem.bar', data.memory.percent);
+            setText('mem.percent', data.memory.percent + '%');
+            setText('mem.total', data.memory.total_formatted);
+            setText('mem.used', data.memory.used_formatted);
+            setText('mem.available', data.memory.available_formatted);
+            setText('mem.swapPercent', data.memory.swap_percent + '%');
+            setText('mem.swapTotal', data.memory.swap_total_formatted);
+
+            setText('net.sent', data.network.sent_speed_formatted);
+            setText('net.recv', data.network.recv_speed_formatted);
+            setText('net.totalSent', data.network.total_sent_formatted);
+            setText('net.totalRecv', data.network.total_recv_formatted);
+            setText('net.packetsSent', formatNumber(data.network.packets_sent));
+            setText('net.packetsRecv', formatNumber(data.network.packets_recv));
+
+            setBar('disk.bar', data.disk.percent);
+            setText('disk.percent', data.disk.percent + '%');
+            setText('disk.total', data.disk.total_formatted);
+            setText('disk.used', data.disk.used_formatted);
+            setText('disk.free', data.disk.free_formatted);
+        }
+
         function showError(message) {
             document.querySelectorAll('.card').forEach(card => {
                 if (card.querySelector('.loading')) {
@@ -517,42 +337,272 @@ if __name__ == '__main__':
                 }
             });
         }
-        
+
+        function applyData(data) {
+            if (data.error) {
+                showError(data.error);
+                return;
+            }
+            if (!cardsBuilt) {
+                buildCards(data);
+                cardsBuilt = true;
+            }
+            // 与合成器对齐，避免在一帧内触发多次布局
+            requestAnimationFrame(() => render(data));
+        }
+
         function fetchSystemData() {
             fetch('/api/system')
                 .then(response => response.json())
-                .then(data => {
-                    if (data.error) {
-                        showError(data.error);
-                        return;
-                    }
-                    
-                    updateSystemInfo(data.system);
-                    updateCPUInfo(data.cpu);
-                    updateMemoryInfo(data.memory);
-                    updateNetworkInfo(data.network);
-                    updateDiskInfo(data.disk);
-                })
+                .then(applyData)
                 .catch(error => {
                     console.error('Error:', error);
                     showError('无法获取系统数据');
                 });
         }
-        
+
         // 初始加载
         fetchSystemData();
-        
-        // 每2秒更新一次
-        setInterval(fetchSystemData, 2000);
+
+        // SSE推送：服务端单条长连接推送数据，浏览器不再每2秒发起HTTP请求；
+        // 不支持EventSource或连接失败时退回轮询
+        if (window.EventSource) {
+            const source = new EventSource('/api/system/stream');
+            source.onmessage = e => applyData(JSON.parse(e.data));
+            source.onerror = () => {
+                // 服务端会周期性结束流，浏览器自动重连即可；
+                // 只有连接被彻底关闭时才退回轮询
+                if (source.readyState === EventSource.CLOSED) {
+                    setInterval(fetchSystemData, 2000);
+                }
+            };
+        } else {
+            setInterval(fetchSystemData, 2000);
+        }
     </script>
 </body>
 </html>'''
-    
-    with open('templates/monitor.html', 'w', encoding='utf-8') as f:
-        f.write(html_template)
-    
+
+
+class SystemMonitor:
+    def __init__(self):
+        self.network_stats_base = psutil.net_io_counters()
+        # 单调时钟不受NTP校时影响，纳秒整数运算也没有浮点误差
+        self.last_network_time_ns = time.monotonic_ns()
+        # 进程生命周期内不变的系统信息只查询一次：
+        # platform.uname在部分系统上会fork子进程，psutil调用也有数十微秒开销
+        self._uname = platform.uname()
+        self._boot_time_str = datetime.fromtimestamp(
+            psutil.boot_time()).strftime('%Y-%m-%d %H:%M:%S')
+        self._cpu_count_physical = psutil.cpu_count(logical=False)
+        self._cpu_count_logical = psutil.cpu_count(logical=True)
+        # 当前时间字符串按秒缓存：刷新循环1Hz，同一秒内不重复strftime
+        self._last_time_sec = -1
+        self._last_time_str = ''
+        # 磁盘用量以分钟为单位变化，statvfs按30秒TTL缓存
+        self._disk_cache = None
+        self._disk_cache_at = 0.0
+        # 预热CPU采样：之后interval=None按两次调用间的差值计算，不会阻塞请求线程
+        psutil.cpu_percent(interval=None)
+        # 后台线程1Hz刷新共享快照：无论多少浏览器标签在轮询，
+        # psutil采样开销恒定，请求线程只做一次字典序列化。
+        # 每次刷新整体替换引用（CPython下原子），读取方无需加锁
+        self._latest = self.get_all_info()
+        threading.Thread(target=self._refresh_loop, daemon=True).start()
+
+    def _refresh_loop(self):
+        """后台采样循环，持续刷新共享快照"""
+        while True:
+            time.sleep(1.0)
+            try:
+                self._latest = self.get_all_info()
+            except Exception:
+                # 瞬时采样失败保留上一份快照，下一轮重试
+                pass
+        
+    @staticmethod
+    def format_bytes(bytes_value):
+        """格式化字节数（bit_length直接定位单位，免循环除法）"""
+        if bytes_value < 1:
+            return _ZERO_BYTES
+        exp = min((int(bytes_value).bit_length() - 1) // 10, len(_UNITS) - 1)
+        return f"{bytes_value / _DIVISORS[exp]:.2f} {_UNITS[exp]}"
+        
+    def get_system_info(self):
+        """获取系统信息（静态部分读实例缓存，时间字符串按秒记忆化）"""
+        now = int(time.time())
+        if now != self._last_time_sec:
+            self._last_time_str = datetime.fromtimestamp(now).strftime('%Y-%m-%d %H:%M:%S')
+            self._last_time_sec = now
+        return {
+            'system': f"{self._uname.system} {self._uname.release}",
+            'machine': self._uname.machine,
+            'boot_time': self._boot_time_str,
+            'hostname': self._uname.node,
+            'current_time': self._last_time_str
+        }
+        
+    def get_cpu_info(self):
+        """获取CPU信息
+
+        interval=None非阻塞取上次调用以来的增量，浏览器2秒轮询一次，
+        统计窗口自然就是2秒；启动后的第一个采样可能读到0。
+        """
+        cpu_percent = psutil.cpu_percent(interval=None)
+        cpu_freq = psutil.cpu_freq()
+        
+        return {
+            'usage_percent': round(cpu_percent, 1),
+            'physical_cores': self._cpu_count_physical,
+            'logical_cores': self._cpu_count_logical,
+            'frequency': round(cpu_freq.current, 1) if cpu_freq else 0
+        }
+        
+    def get_memory_info(self):
+        """获取内存信息"""
+        memory = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        # 一次调用里格式化七个值，绑定到局部变量少走属性查找
+        format_bytes = self.format_bytes
+        
+        return {
+            'total': memory.total,
+            'total_formatted': format_bytes(memory.total),
+            'available': memory.available,
+            'available_formatted': format_bytes(memory.available),
+            'used': memory.used,
+            'used_formatted': format_bytes(memory.used),
+            'percent': round(memory.percent, 1),
+            'swap_total': swap.total,
+            'swap_total_formatted': format_bytes(swap.total),
+            'swap_used': swap.used,
+            'swap_used_formatted': format_bytes(swap.used),
+            'swap_percent': round(swap.percent, 1) if swap.total > 0 else 0
+        }
+        
+    def get_network_info(self, counters=None):
+        """获取网络信息（可复用调用方已取好的计数器，避免重复系统调用）"""
+        current_network = counters if counters is not None else psutil.net_io_counters()
+        now_ns = time.monotonic_ns()
+        dt_ns = now_ns - self.last_network_time_ns
+        format_bytes = self.format_bytes
+
+        # 基准值在__init__里就是一份真实快照，单调时钟保证dt_ns>=0，
+        # 只需防一下同纳秒内的重入，无需整块复制的零值分支
+        sent_speed = 0
+        recv_speed = 0
+        if dt_ns > 0:
+            sent_speed = (current_network.bytes_sent - self.network_stats_base.bytes_sent) * 1_000_000_000 // dt_ns
+            recv_speed = (current_network.bytes_recv - self.network_stats_base.bytes_recv) * 1_000_000_000 // dt_ns
+
+            self.network_stats_base = current_network
+            self.last_network_time_ns = now_ns
+
+        return {
+            'sent_speed': sent_speed,
+            'sent_speed_formatted': format_bytes(sent_speed) + '/s',
+            'recv_speed': recv_speed,
+            'recv_speed_formatted': format_bytes(recv_speed) + '/s',
+            'total_sent': current_network.bytes_sent,
+            'total_sent_formatted': format_bytes(current_network.bytes_sent),
+            'total_recv': current_network.bytes_recv,
+            'total_recv_formatted': format_bytes(current_network.bytes_recv),
+            'packets_sent': current_network.packets_sent,
+            'packets_recv': current_network.packets_recv
+        }
+
+    def get_disk_info(self):
+        """获取磁盘信息（30秒TTL缓存，磁盘用量变化远慢于采样频率）"""
+        now = time.monotonic()
+        if self._disk_cache is not None and now - self._disk_cache_at < 30.0:
+            return self._disk_cache
+        disk_usage = psutil.disk_usage('/')
+        self._disk_cache = {
+            'total': disk_usage.total,
+            'total_formatted': self.format_bytes(disk_usage.total),
+            'used': disk_usage.used,
+            'used_formatted': self.format_bytes(disk_usage.used),
+            'free': disk_usage.free,
+            'free_formatted': self.format_bytes(disk_usage.free),
+            'percent': round((disk_usage.used / disk_usage.total) * 100, 1)
+        }
+        self._disk_cache_at = now
+        return self._disk_cache
+        
+    def get_all_info(self):
+        """获取所有系统信息"""
+        # 同一次请求内net_io_counters只查询一次，速度与总量共用同一份快照
+        counters = psutil.net_io_counters()
+        return {
+            'system': self.get_system_info(),
+            'cpu': self.get_cpu_info(),
+            'memory': self.get_memory_info(),
+            'network': self.get_network_info(counters),
+            'disk': self.get_disk_info()
+        }
+
+# 创建监控器实例
+monitor = SystemMonitor()
+
+@app.route('/')
+def index():
+    """主页面（直接返回内存中的静态HTML，跳过Jinja渲染）"""
+    return Response(_MONITOR_HTML, mimetype='text/html')
+
+@app.route('/api/system/stream')
+def api_system_stream():
+    """SSE推送流：一条长连接按服务端节奏推送快照，免去客户端轮询开销
+
+    每条连接占用一个服务线程，所以推满300条（约5分钟）后主动结束，
+    浏览器的EventSource会自动重连——长连接不再永久钉死线程池里的线程。
+    """
+    def generate():
+        for _ in range(300):
+            yield b"data: " + orjson.dumps(monitor._latest) + b"\n\n"
+            time.sleep(1.0)
+    return Response(generate(), mimetype='text/event-stream')
+
+
+@app.route('/api/system')
+def api_system():
+    """获取系统信息API（orjson编码共享快照，ETag命中时省去响应体传输）"""
+    try:
+        payload = orjson.dumps(monitor._latest)
+        # blake2b只为去重不为安全，8字节摘要足够
+        etag = hashlib.blake2b(payload, digest_size=8).hexdigest()
+        if request.headers.get('If-None-Match') == etag:
+            return '', 304
+        resp = Response(payload, mimetype='application/json')
+        resp.headers['ETag'] = etag
+        return resp
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+if __name__ == '__main__':
+    # 兼容旧的templates/monitor.html部署方式：仅在内容变化时落盘，
+    # 避免每次启动都做一次无谓的磁盘写入
+    import hashlib
+    import os
+    template_path = os.path.join('templates', 'monitor.html')
+    digest = hashlib.sha256(_MONITOR_HTML.encode('utf-8')).hexdigest()
+    on_disk = None
+    if os.path.exists(template_path):
+        with open(template_path, 'rb') as f:
+            on_disk = hashlib.sha256(f.read()).hexdigest()
+    if on_disk != digest:
+        os.makedirs('templates', exist_ok=True)
+        with open(template_path, 'w', encoding='utf-8') as f:
+            f.write(_MONITOR_HTML)
+
     print("🚀 Mac系统监控器 Web版本正在启动...")
     print("📱 请在浏览器中访问: http://localhost:5000")
     print("🛑 按 Ctrl+C 停止服务")
-    
-    app.run(host='0.0.0.0', port=5000, debug=False)
\ No newline at end of file
+
+    # 优先用waitress：多线程+keep-alive，多个标签页轮询不再在
+    # Werkzeug单线程开发服务器上排队；未安装时退回开发服务器。
+    # SSE每条流都长时间占着线程，线程数要给足，否则几个标签页就把池占满
+    try:
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=5000, threads=32)
+    except ImportError:
+        app.run(host='0.0.0.0', port=5000, debug=False)
@@ -1,8 +1,10 @@
 """
 地理问答模型训练
 """
+import functools
 import json
-from typing import List, Dict, Tuple
+from collections import Counter
+from typing import List, Dict, Optional, Tuple
 import os
 
 try:
@@ -34,6 +36,41 @@ except ImportError:
     HAS_OPENCC = False
     print("opencc未安装，跳过繁简转换")
 
+try:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    HAS_SKLEARN = True
+except ImportError:
+    HAS_SKLEARN = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _load_json(path):
+    """整文件读入字节后解析（优先orjson，比标准库快数倍且GC压力更小）"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+if HAS_JIEBA:
+    # 同一字符串反复分词直接命中缓存；返回tuple保证可哈希且不可变
+    @functools.lru_cache(maxsize=200_000)
+    def _jieba_cut(text: str) -> tuple:
+        return tuple(jieba.lcut(text))
+else:
+    import re
+
+    _CHAR_TOKEN_RE = re.compile(r'[一-鿿]|[A-Za-z0-9]+')
+
+    # jieba缺失时的退化分词：汉字逐字、字母数字按连续段切，
+    # 粒度够细保证短查询和库内问题仍有token交集
+    @functools.lru_cache(maxsize=200_000)
+    def _jieba_cut(text: str) -> tuple:
+        return tuple(_CHAR_TOKEN_RE.findall(text))
+
 if HAS_TORCH:
     class GeographyQADataset(Dataset):
         def __init__(self, data_path: str, tokenizer, max_length: int = 512):
@@ -41,66 +78,133 @@ if HAS_TORCH:
             self.max_length = max_length
             if HAS_OPENCC:
                 self.converter = opencc.OpenCC('t2s')  # 繁体转简体
+                # 繁简转换按原文缓存，重复字符串不重复过OpenCC
+                self._convert = functools.lru_cache(maxsize=50_000)(self.converter.convert)
             else:
                 self.converter = None
+                self._convert = lambda text: text
             
-            with open(data_path, 'r', encoding='utf-8') as f:
-                self.data = json.load(f)
+            self.data = _load_json(data_path)
             
             self.processed_data = self._preprocess_data()
     
-    def _preprocess_data(self):
-        """预处理数据，将问答对转换为适合模型的格式"""
-        processed = []
+        def _preprocess_data(self):
+            """预处理数据，将问答对转换为适合模型的格式"""
+            processed = []
         
-        for item in self.data:
-            question = self.converter.convert(item['question'])
-            answer = self.converter.convert(item['answer'])
+            for item in self.data:
+                question = self._convert(item['question'])
+                answer = self._convert(item['answer'])
             
-            # 对于问答任务，我们将答案作为context，问题作为question
-            context = answer
+                # 对于问答任务，我们将答案作为context，问题作为question
+                context = answer
             
-            processed.append({
-                'question': question,
-                'context': context,
-                'answer': answer,
-                'start_position': 0,  # 答案在context中的开始位置
-                'end_position': len(answer) - 1  # 答案在context中的结束位置
-            })
+                processed.append({
+                    'question': question,
+                    'context': context,
+                    'answer': answer,
+                    'start_position': 0,  # 答案在context中的开始位置
+                    'end_position': len(answer) - 1  # 答案在context中的结束位置
+                })
         
-        return processed
-    
-    def __len__(self):
-        return len(self.processed_data)
-    
-    def __getitem__(self, idx):
-        item = self.processed_data[idx]
+            # 整个数据集只分词一次：fast tokenizer吃整个列表远快于逐条调用，
+            # 也免得每个epoch都在__getitem__里重做一模一样的分词
+            encodings = self.tokenizer(
+                [p['question'] for p in processed],
+                [p['context'] for p in processed],
+                truncation=True,
+                max_length=self.max_length
+            )
         
-        # 编码问题和上下文
-        encoding = self.tokenizer(
-            item['question'],
-            item['context'],
-            truncation=True,
-            padding='max_length',
-            max_length=self.max_length,
-            return_tensors='pt'
-        )
+            # SoA打包：一次pad到数据集实际最长（远小于512），
+            # ids存int32、mask存bool，__getitem__返回零拷贝视图
+            self.lengths = [len(ids) for ids in encodings['input_ids']]
+            pad_to = max(self.lengths, default=0)
+            pad_id = self.tokenizer.pad_token_id or 0
+            n = len(processed)
+            self.input_ids = torch.full((n, pad_to), pad_id, dtype=torch.int32)
+            self.attention_mask = torch.zeros((n, pad_to), dtype=torch.bool)
+            for i, ids in enumerate(encodings['input_ids']):
+                length = self.lengths[i]
+                self.input_ids[i, :length] = torch.tensor(ids, dtype=torch.int32)
+                self.attention_mask[i, :length] = True
+            self.start_positions = torch.tensor(
+                [p['start_position'] for p in processed], dtype=torch.int16)
+            self.end_positions = torch.tensor(
+                [p['end_position'] for p in processed], dtype=torch.int16)
         
-        return {
-            'input_ids': encoding['input_ids'].flatten(),
-            'attention_mask': encoding['attention_mask'].flatten(),
-            'start_positions': torch.tensor(item['start_position'], dtype=torch.long),
-            'end_positions': torch.tensor(item['end_position'], dtype=torch.long)
-        }
+            return processed
+    
+        def __len__(self):
+            return len(self.processed_data)
+    
+        def __getitem__(self, idx):
+            # 打包张量的行视图，不产生新分配；collate再按batch内最长截断
+            return {
+                'input_ids': self.input_ids[idx],
+                'attention_mask': self.attention_mask[idx],
+                'length': self.lengths[idx],
+                'start_positions': int(self.start_positions[idx]),
+                'end_positions': int(self.end_positions[idx])
+            }
 
 class GeographyQAModel:
     def __init__(self, model_name: str = "hfl/chinese-bert-wwm-ext"):
         self.model_name = model_name
-        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-        self.model = AutoModelForQuestionAnswering.from_pretrained(model_name)
+        # use_fast显式锁定Rust tokenizer，批量编码比纯Python实现快一个量级
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        # GPU上用bf16加载：注意力/FFN的访存减半，Ampere+上算力约翻倍
+        dtype = torch.bfloat16 if torch.cuda.is_available() else torch.float32
+        self.model = AutoModelForQuestionAnswering.from_pretrained(
+            model_name, torch_dtype=dtype)
         self.model.to(self.device)
-        
+        # 推理为默认状态：关闭dropout等训练期行为（train()入口由Trainer自己切换）
+        self.model.eval()
+        # 推理走单独的句柄：self.model保持原生模块供Trainer/save_model使用，
+        # BT变换或compile过的模型存的是转换后权重，直接保存无法再from_pretrained
+        self._infer_model = self._optimize_for_inference(self.model)
+        # 问答pipeline只构建一次：每次调用都重建会重复加载配置和后处理器
+        self._qa_pipeline = None
+
+    def _optimize_for_inference(self, model):
+        """可选的推理加速：BetterTransformer融合注意力 + torch.compile
+
+        两者都不是硬依赖，缺失或失败时直接退回eager模型。
+        返回的是独立副本，传入的原生模型不被改动。
+        """
+        try:
+            from optimum.bettertransformer import BetterTransformer
+            # keep_original_model=True：变换产物是新对象，原模型原样留给训练/保存
+            model = BetterTransformer.transform(model, keep_original_model=True)
+        except Exception:
+            pass
+        # compile只在CUDA上做：CPU盒子上光构造模型就要白付数秒编译时间，
+        # 收益却撑不起这笔开销（与bf16的按设备启用保持一致）
+        if torch.cuda.is_available():
+            try:
+                model = torch.compile(model, mode='reduce-overhead', fullgraph=False)
+                # 用一条dummy输入触发编译，避免首个真实请求吃掉编译时间
+                warmup = self.tokenizer("预热", "编译预热", return_tensors='pt').to(self.device)
+                with torch.inference_mode():
+                    model(**warmup)
+            except Exception:
+                pass
+        return model
+
+    @property
+    def qa_pipeline(self):
+        """惰性构建并复用的问答pipeline（batch_size=16走HF的批量前向）"""
+        if self._qa_pipeline is None:
+            self._qa_pipeline = pipeline(
+                "question-answering",
+                model=self._infer_model,
+                tokenizer=self.tokenizer,
+                device=0 if torch.cuda.is_available() else -1,
+                batch_size=16
+            )
+        return self._qa_pipeline
+
     def train(self, train_data_path: str, val_data_path: str, output_dir: str = "/workspace/models/trained_model"):
         """训练模型"""
         
@@ -123,31 +227,80 @@ class GeographyQAModel:
             save_strategy="steps",
             save_steps=500,
             load_best_model_at_end=True,
+            # 长度分桶：相近长度的样本同批，动态padding浪费最小
+            # （真正的分桶靠下面的采样器覆写，见_LengthGroupedTrainer）
+            group_by_length=True,
+            # 混合精度：Ampere+优先bf16（无需loss scaling），老卡退回fp16
+            bf16=torch.cuda.is_available() and torch.cuda.is_bf16_supported(),
+            fp16=torch.cuda.is_available() and not torch.cuda.is_bf16_supported(),
+            # 梯度累积4步：有效batch=32而显存占用仍按8算
+            gradient_accumulation_steps=4,
+            # 数据加载与计算重叠，pin_memory让H2D拷贝走DMA
+            dataloader_num_workers=4,
+            dataloader_pin_memory=True,
+            # 融合AdamW把参数更新合并为单kernel
+            optim="adamw_torch_fused" if torch.cuda.is_available() else "adamw_torch",
         )
         
+        def collate(batch):
+            """堆叠SoA行视图并按batch内最长截断；喂模型前转回int64"""
+            # 长度向上取整到8的倍数：fp16/bf16下矩阵维度8对齐
+            # 才能全程走Tensor Core，几个pad token换掉慢速尾块
+            max_len = -(-max(b['length'] for b in batch) // 8) * 8
+            max_len = min(max_len, batch[0]['input_ids'].shape[0])
+            return {
+                'input_ids': torch.stack([b['input_ids'] for b in batch])[:, :max_len].long(),
+                'attention_mask': torch.stack([b['attention_mask'] for b in batch])[:, :max_len].long(),
+                'start_positions': torch.tensor([b['start_positions'] for b in batch], dtype=torch.long),
+                'end_positions': torch.tensor([b['end_positions'] for b in batch], dtype=torch.long),
+            }
+
+        # 普通torch Dataset没有length列可读，Trainer默认去量input_ids——
+        # SoA打包后每行等宽，分桶会退化成无操作。覆写采样器，
+        # 把数据集预计算的真实长度直接喂给LengthGroupedSampler
+        class _LengthGroupedTrainer(Trainer):
+            def _get_train_sampler(self, *args, **kwargs):
+                if self.args.group_by_length:
+                    from transformers.trainer_pt_utils import LengthGroupedSampler
+                    return LengthGroupedSampler(
+                        self.args.train_batch_size * self.args.gradient_accumulation_steps,
+                        lengths=self.train_dataset.lengths,
+                    )
+                return super()._get_train_sampler(*args, **kwargs)
+
         # 创建训练器
-        trainer = Trainer(
+        trainer = _LengthGroupedTrainer(
             model=self.model,
             args=training_args,
             train_dataset=train_dataset,
             eval_dataset=val_dataset,
             tokenizer=self.tokenizer,
+            data_collator=collate,
         )
         
         # 开始训练
         print("开始训练模型...")
         trainer.train()
         
-        # 保存模型
+        # 保存模型（self.model全程保持原生模块，state_dict可直接from_pretrained）
         trainer.save_model()
         self.tokenizer.save_pretrained(output_dir)
+        # 权重已被训练原地更新，推理句柄和pipeline基于旧权重，重建
+        self._infer_model = self._optimize_for_inference(self.model)
+        self._qa_pipeline = None
         print(f"模型已保存到: {output_dir}")
     
     def load_model(self, model_path: str):
         """加载训练好的模型"""
-        self.tokenizer = AutoTokenizer.from_pretrained(model_path)
-        self.model = AutoModelForQuestionAnswering.from_pretrained(model_path)
+        self.tokenizer = AutoTokenizer.from_pretrained(model_path, use_fast=True)
+        dtype = torch.bfloat16 if torch.cuda.is_available() else torch.float32
+        self.model = AutoModelForQuestionAnswering.from_pretrained(
+            model_path, torch_dtype=dtype)
         self.model.to(self.device)
+        self.model.eval()
+        self._infer_model = self._optimize_for_inference(self.model)
+        # 模型换了，缓存的pipeline随之失效
+        self._qa_pipeline = None
         print(f"模型已从 {model_path} 加载")
     
     def answer_question(self, question: str, context: str = None) -> str:
@@ -156,46 +309,143 @@ class GeographyQAModel:
             # 如果没有提供上下文，使用简单的关键词匹配从训练数据中找到相关上下文
             context = self._find_relevant_context(question)
         
-        # 创建问答pipeline
-        qa_pipeline = pipeline(
-            "question-answering",
-            model=self.model,
-            tokenizer=self.tokenizer,
-            device=0 if torch.cuda.is_available() else -1
-        )
-        
-        result = qa_pipeline(question=question, context=context)
+        result = self.qa_pipeline(question=question, context=context)
         return result['answer']
+
+    def answer_questions(self, questions: List[str], contexts: Optional[List[str]] = None,
+                         return_confidence: bool = False):
+        """批量回答问题：一次分词、一次前向、批量argmax
+
+        直接走model.forward绕开pipeline的逐例Python开销，
+        整批只有一次设备同步。return_confidence=True时额外返回
+        每条答案的置信度列表。
+        """
+        if contexts is None:
+            contexts = [self._find_relevant_context(q) for q in questions]
+        
+        inputs = self.tokenizer(
+            questions,
+            contexts,
+            padding=True,
+            truncation=True,
+            max_length=512,
+            return_tensors='pt'
+        ).to(self.device)
+        
+        # inference_mode比no_grad更彻底地关闭autograd记录
+        with torch.inference_mode():
+            outputs = self._infer_model(**inputs)
+        
+        start_logits = outputs.start_logits
+        end_logits = outputs.end_logits
+        
+        # 标准SQuAD联合解码：start+end打分矩阵mask掉end<start的下三角后
+        # 一次argmax，单kernel单次同步，天然不会产生非法区间
+        seq_len = start_logits.size(-1)
+        joint = start_logits.unsqueeze(-1) + end_logits.unsqueeze(-2)
+        valid = torch.ones(seq_len, seq_len, dtype=torch.bool, device=joint.device).triu()
+        joint = joint.masked_fill(~valid, float('-inf'))
+        flat = joint.view(joint.size(0), -1).argmax(-1)
+        starts = (flat // seq_len).tolist()
+        ends = (flat % seq_len).tolist()
+        
+        answers = []
+        for i, (start, end) in enumerate(zip(starts, ends)):
+            tokens = inputs['input_ids'][i][start:end + 1]
+            answers.append(self.tokenizer.decode(tokens, skip_special_tokens=True))
+        
+        if not return_confidence:
+            return answers
+        
+        # 置信度只需argmax处的概率：max - logsumexp后对两个标量取exp，
+        # 不做全序列softmax，设备到主机也只同步这一次
+        start_prob = (start_logits.max(-1).values - torch.logsumexp(start_logits, dim=-1)).exp()
+        end_prob = (end_logits.max(-1).values - torch.logsumexp(end_logits, dim=-1)).exp()
+        confidences = ((start_prob + end_prob) * 0.5).tolist()
+        return answers, confidences
     
-    def _find_relevant_context(self, question: str) -> str:
-        """根据问题找到相关的上下文"""
-        # 这里可以实现更复杂的检索逻辑
-        # 简单起见，返回一个通用的地理知识上下文
-        return """中国是一个地域辽阔的国家，拥有34个省级行政区，包括23个省、5个自治区、4个直辖市和2个特别行政区。
+    _DEFAULT_CONTEXT = """中国是一个地域辽阔的国家，拥有34个省级行政区，包括23个省、5个自治区、4个直辖市和2个特别行政区。
         中国的主要河流有长江、黄河、珠江等，主要山脉有喜马拉雅山、昆仑山、天山等。
         各省都有自己的省会城市，比如北京是首都，上海是直辖市，广东省的省会是广州，四川省的省会是成都。"""
 
+    def _build_context_index(self):
+        """惰性构建数据集上的TF-IDF检索索引
+
+        字符n-gram不依赖中文分词器；查询时一次稀疏矩阵乘法代替
+        Python逐条子串扫描。数据集或sklearn缺失时退化为通用上下文。
+        """
+        self._ctx_index_built = True
+        self._ctx_vectorizer = None
+        if not HAS_SKLEARN:
+            return
+        try:
+            kb = _load_json("/workspace/data/geography_qa.json")
+        except (FileNotFoundError, ValueError):
+            return
+        if not kb:
+            return
+        self._ctx_answers = [item['answer'] for item in kb]
+        corpus = [f"{item['question']} {item.get('category', '')} {item['answer']}"
+                  for item in kb]
+        self._ctx_vectorizer = TfidfVectorizer(analyzer='char_wb', ngram_range=(1, 2))
+        self._ctx_matrix = self._ctx_vectorizer.fit_transform(corpus)
+
+    def _find_relevant_context(self, question: str) -> str:
+        """根据问题检索最相关的上下文（TF-IDF稀疏点积取argmax）"""
+        if not getattr(self, '_ctx_index_built', False):
+            self._build_context_index()
+        if self._ctx_vectorizer is not None:
+            query = self._ctx_vectorizer.transform([question])
+            scores = (self._ctx_matrix @ query.T).toarray().ravel()
+            best = int(scores.argmax())
+            if scores[best] > 0:
+                return self._ctx_answers[best]
+        # 检索不可用或无命中时退回通用地理知识上下文
+        return self._DEFAULT_CONTEXT
+
 class SimpleGeographyQA:
     """简单的基于规则的地理问答系统，用于快速演示"""
     
     def __init__(self):
         self.qa_data = {}
+        # 倒排索引相关结构：问题列表、答案列表、每题的token集合、token->题号
+        self.questions = []
+        self.answers = []
+        self.q_tokens = []
+        self.inverted = {}
         self.load_qa_data()
     
     def load_qa_data(self):
         """加载问答数据"""
         try:
-            with open("/workspace/data/geography_qa.json", 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _load_json("/workspace/data/geography_qa.json")
                 
             # 构建问答字典
             for item in data:
                 question = item['question'].lower().strip('？?')
                 self.qa_data[question] = item['answer']
-                
+
+            # 加载时一次性分词并建倒排索引，查询不再逐条重新分词全库
+            self.questions = list(self.qa_data.keys())
+            self.answers = list(self.qa_data.values())
+            self.q_tokens = [frozenset(_jieba_cut(q)) for q in self.questions]
+            self.inverted = {}
+            for i, tokens in enumerate(self.q_tokens):
+                for token in tokens:
+                    self.inverted.setdefault(token, []).append(i)
+
         except FileNotFoundError:
             print("问答数据文件未找到，请先生成数据集")
     
+    def _candidate_ids(self, tokens) -> set:
+        """通过倒排索引取出与查询共享至少一个token的问题编号"""
+        candidates = set()
+        for token in tokens:
+            ids = self.inverted.get(token)
+            if ids:
+                candidates.update(ids)
+        return candidates
+
     def answer(self, question: str) -> str:
         """回答问题"""
         question_clean = question.lower().strip('？?')
@@ -204,45 +454,33 @@ class SimpleGeographyQA:
         if question_clean in self.qa_data:
             return self.qa_data[question_clean]
         
-        # 模糊匹配
-        for q, a in self.qa_data.items():
-            if self._similarity(question_clean, q) > 0.7:
-                return a
+        # 模糊匹配：查询只分词一次，Jaccard只算倒排索引命中的候选
+        query_tokens = frozenset(_jieba_cut(question_clean))
+        candidates = self._candidate_ids(query_tokens)
+        if query_tokens:
+            for i in candidates:
+                tokens = self.q_tokens[i]
+                similarity = len(query_tokens & tokens) / len(query_tokens | tokens)
+                if similarity > 0.7:
+                    return self.answers[i]
         
         # 关键词匹配
         return self._keyword_match(question)
     
-    def _similarity(self, s1: str, s2: str) -> float:
-        """计算两个字符串的相似度"""
-        words1 = set(jieba.cut(s1))
-        words2 = set(jieba.cut(s2))
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
-        
-        return len(intersection) / len(union)
-    
     def _keyword_match(self, question: str) -> str:
-        """基于关键词的匹配"""
-        keywords = list(jieba.cut(question))
+        """基于关键词的匹配（倒排索引计数，只统计有命中的候选）"""
+        keywords = _jieba_cut(question)
         
-        best_match = ""
-        best_score = 0
+        scores = Counter()
+        for keyword in keywords:
+            for i in self.inverted.get(keyword, ()):
+                scores[i] += 1
         
-        for q, a in self.qa_data.items():
-            score = 0
-            for keyword in keywords:
-                if keyword in q:
-                    score += 1
-            
-            if score > best_score:
-                best_score = score
-                best_match = a
+        if scores:
+            best_id, _ = scores.most_common(1)[0]
+            return self.answers[best_id]
         
-        return best_match if best_match else "抱歉，我无法回答这个问题。请尝试问一些关于中国地理的问题。"
+        return "抱歉，我无法回答这个问题。请尝试问一些关于中国地理的问题。"
 
 if __name__ == "__main__":
     # 简单测试
@@ -2,58 +2,110 @@
 简单地理问答系统
 """
 import json
+import os
+import pickle
 import re
+from collections import Counter
 from typing import Dict, List
 
+# 连续汉字或连续字母数字各成一个token，C实现一次扫完整个字符串
+_TOKEN_RE = re.compile(r'[\u4e00-\u9fff]+|[A-Za-z0-9]+')
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _load_json(path):
+    """整文件读入字节后解析（优先orjson，比标准库快数倍且GC压力更小）"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
 class SimpleGeographyQA:
     """简单的基于规则的地理问答系统"""
     
     def __init__(self):
         self.qa_data = {}
+        # 倒排索引相关结构：问题列表、答案列表、每题的token集合、token->题号
+        self.questions = []
+        self.answers = []
+        self.q_tokens = []
+        self.inverted = {}
         self.load_qa_data()
     
     def load_qa_data(self):
         """加载问答数据"""
+        data_path = "/workspace/data/geography_qa.json"
+        index_path = "/workspace/data/geography_qa_index.pkl"
         try:
-            with open("/workspace/data/geography_qa.json", 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # 索引缓存比数据文件新时直接反序列化，跳过分词和建索引
+            if self._load_index_cache(data_path, index_path):
+                return
+
+            data = _load_json(data_path)
                 
             # 构建问答字典
             for item in data:
                 question = item['question'].lower().strip('？?')
                 self.qa_data[question] = item['answer']
-                
+
+            # 加载时一次性建倒排索引：查询只需考察与问题至少共享
+            # 一个token的候选，而不是全库线性扫描
+            self.questions = list(self.qa_data.keys())
+            self.answers = list(self.qa_data.values())
+            self.q_tokens = [frozenset(self.simple_tokenize(q)) for q in self.questions]
+            self.inverted = {}
+            for i, tokens in enumerate(self.q_tokens):
+                for token in tokens:
+                    self.inverted.setdefault(token, []).append(i)
+
+            self._save_index_cache(index_path)
+
         except FileNotFoundError:
             print("问答数据文件未找到，请先生成数据集")
+
+    def _load_index_cache(self, data_path: str, index_path: str) -> bool:
+        """尝试加载序列化的索引，仅当缓存不早于数据文件时命中"""
+        try:
+            if os.path.getmtime(index_path) < os.path.getmtime(data_path):
+                return False
+            with open(index_path, 'rb') as f:
+                state = pickle.load(f)
+            (self.qa_data, self.questions, self.answers,
+             self.q_tokens, self.inverted) = state
+            return True
+        except Exception:
+            # 截断、格式过期等任何坏缓存都按未命中处理，走正常重建
+            return False
+
+    def _save_index_cache(self, index_path: str):
+        """持久化索引（尽力而为，写不进去不影响正常服务）"""
+        try:
+            with open(index_path, 'wb') as f:
+                pickle.dump((self.qa_data, self.questions, self.answers,
+                             self.q_tokens, self.inverted), f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            pass
     
     def simple_tokenize(self, text: str) -> List[str]:
-        """简单的中文分词"""
-        # 简单的中文字符分词
-        words = []
-        current_word = ""
-        
-        for char in text:
-            if '\u4e00' <= char <= '\u9fff':  # 中文字符
-                if current_word and not ('\u4e00' <= current_word[-1] <= '\u9fff'):
-                    words.append(current_word)
-                    current_word = char
-                else:
-                    current_word += char
-            else:
-                if current_word:
-                    if '\u4e00' <= current_word[-1] <= '\u9fff':
-                        words.append(current_word)
-                        current_word = char
-                    else:
-                        current_word += char
-                else:
-                    current_word += char
-        
-        if current_word:
-            words.append(current_word)
-        
-        return [w.strip() for w in words if w.strip()]
+        """简单的中文分词（纯ASCII直接按空白切，其余交给预编译正则）"""
+        if text.isascii():
+            return text.split()
+        return _TOKEN_RE.findall(text)
     
+    def _candidate_ids(self, tokens) -> set:
+        """通过倒排索引取出与查询共享至少一个token的问题编号"""
+        candidates = set()
+        for token in tokens:
+            ids = self.inverted.get(token)
+            if ids:
+                candidates.update(ids)
+        return candidates
+
     def answer(self, question: str) -> str:
         """回答问题"""
         question_clean = question.lower().strip('？?')
@@ -62,14 +114,35 @@ class SimpleGeographyQA:
         if question_clean in self.qa_data:
             return self.qa_data[question_clean]
         
-        # 模糊匹配
-        for q, a in self.qa_data.items():
-            if self._similarity(question_clean, q) > 0.7:
-                return a
+        # 模糊匹配：查询只分词一次，Jaccard只算倒排索引命中的候选
+        query_tokens = frozenset(self.simple_tokenize(question_clean))
+        candidates = self._candidate_ids(query_tokens)
+        if query_tokens:
+            for i in candidates:
+                tokens = self.q_tokens[i]
+                similarity = len(query_tokens & tokens) / len(query_tokens | tokens)
+                if similarity > 0.7:
+                    return self.answers[i]
         
         # 关键词匹配
         return self._keyword_match(question)
     
+    def answer_batch(self, questions: List[str]) -> List[str]:
+        """批量回答问题
+
+        同一批内重复的问题只查找一次，结果按原顺序回填；
+        批内去重把每次请求的固定开销摊到整批上。
+        """
+        cache = {}
+        results = []
+        for question in questions:
+            answer = cache.get(question)
+            if answer is None:
+                answer = self.answer(question)
+                cache[question] = answer
+            results.append(answer)
+        return results
+
     def _similarity(self, s1: str, s2: str) -> float:
         """计算两个字符串的相似度"""
         words1 = set(self.simple_tokenize(s1))
@@ -84,23 +157,31 @@ class SimpleGeographyQA:
         return len(intersection) / len(union)
     
     def _keyword_match(self, question: str) -> str:
-        """基于关键词的匹配"""
-        keywords = self.simple_tokenize(question)
+        """基于关键词的匹配（倒排索引计数，只统计有命中的候选）"""
+        # 索引里的token都来自小写化后的问题，查询也先小写化对齐
+        keywords = self.simple_tokenize(question.lower())
         
-        best_match = ""
-        best_score = 0
+        scores = Counter()
+        for keyword in keywords:
+            for i in self.inverted.get(keyword, ()):
+                scores[i] += 1
         
-        for q, a in self.qa_data.items():
-            score = 0
-            for keyword in keywords:
-                if keyword in q:
-                    score += 1
-            
+        if scores:
+            best_id, _ = scores.most_common(1)[0]
+            return self.answers[best_id]
+
+        # token级没有任何命中时退回子串包含：simple_tokenize把连续汉字
+        # 合成一个token（"长江有多长"整体是一个token），"长江"这类短查询
+        # 只有靠子串扫描才能像原实现一样匹配到库内问题
+        best_id, best_score = -1, 0
+        for i, stored_question in enumerate(self.questions):
+            score = sum(1 for keyword in keywords if keyword in stored_question)
             if score > best_score:
-                best_score = score
-                best_match = a
-        
-        return best_match if best_match else "抱歉，我无法回答这个问题。请尝试问一些关于中国地理的问题，比如省会城市、河流、山脉等。"
+                best_id, best_score = i, score
+        if best_score:
+            return self.answers[best_id]
+
+        return "抱歉，我无法回答这个问题。请尝试问一些关于中国地理的问题，比如省会城市、河流、山脉等。"
 
 if __name__ == "__main__":
     # 简单测试
@@ -5,13 +5,41 @@
 根据用户输入搜索相关新闻，并提供进一步的详细搜索功能
 """
 
+import functools
+import hashlib
+import heapq
+from collections import Counter
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import json
 import re
+import threading
+from cachetools import TTLCache
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from urllib.parse import quote, urljoin
-import time
+
+# 关键词提取的正则和停用词在模块加载时构建一次，不随调用重建
+_CJK_RE = re.compile(r'[\u4e00-\u9fff]+')
+_STOP_WORDS = frozenset({'的', '了', '在', '是', '有', '和', '与', '或', '但', '与其', '关于', '对于', '由于', '因为', '所以', '因此', '然而', '虽然', '尽管', '而且', '并且', '同时', '另外', '此外', '最新', '报道', '消息', '新闻', '发展', '分析', '观点', '专家', '市场', '技术', '政策', '国际', '全球'})
+
+
+def _title_hash(title: str) -> int:
+    """标题归一化后取8字节blake2b摘要，去重集合只存小整数不存长字符串"""
+    digest = hashlib.blake2b(title.strip().lower().encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_keywords_cached(text: str) -> tuple:
+    """从文本中提取关键词（按文本整体缓存，重复标题零开销）"""
+    if not text:
+        return ()
+    words = _CJK_RE.findall(text)
+    keywords = [word for word in words if len(word) >= 2 and word not in _STOP_WORDS]
+    # 只需前5个最长的词，nlargest是O(n log 5)而非整体排序的O(n log n)
+    return tuple(heapq.nlargest(5, keywords, key=len))
 
 
 class NewsAgent:
@@ -25,6 +53,11 @@ class NewsAgent:
             'bing': 'https://www.bing.com/news/search',
             'google': 'https://news.google.com/rss/search'
         }
+        # 相关新闻的关键词搜索缓存：不同新闻的标题经常共享热门关键词，
+        # 缓存每个关键词的搜索结果避免重复抓取。关键词来自用户提交的
+        # 标题，TTLCache封顶+到期自动淘汰，普通dict会被撑到无界
+        self._keyword_cache = TTLCache(maxsize=1024, ttl=300)
+        self._keyword_cache_lock = threading.Lock()
     
     def search_news(self, query: str, limit: int = 10, days_back: int = 7) -> List[Dict]:
         """
@@ -40,22 +73,21 @@ class NewsAgent:
         """
         news_results = []
         
-        # 尝试多个搜索源
-        try:
-            # 使用 NewsAPI 风格的搜索
-            news_results.extend(self._search_with_bing_news(query, limit // 2))
-        except Exception as e:
-            print(f"Bing News 搜索失败: {e}")
-        
-        try:
-            # 使用其他新闻源
-            news_results.extend(self._search_with_alternative_sources(query, limit // 2))
-        except Exception as e:
-            print(f"备用新闻源搜索失败: {e}")
+        # 两个搜索源互相独立，纯IO并发执行，总耗时从两者之和降为较慢者
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = {
+                executor.submit(self._search_with_bing_news, query, limit // 2): "Bing News",
+                executor.submit(self._search_with_alternative_sources, query, limit // 2): "备用新闻源",
+            }
+            for future, source_name in futures.items():
+                try:
+                    news_results.extend(future.result())
+                except Exception as e:
+                    print(f"{source_name} 搜索失败: {e}")
         
-        # 去重并按时间排序
+        # 去重并按时间排序（_ts是入库时解析好的epoch秒，itemgetter走C路径）
         unique_news = self._deduplicate_news(news_results)
-        sorted_news = sorted(unique_news, key=lambda x: x.get('published_at', ''), reverse=True)
+        sorted_news = sorted(unique_news, key=itemgetter('_ts'), reverse=True)
         
         return sorted_news[:limit]
     
@@ -64,12 +96,14 @@ class NewsAgent:
         results = []
         
         # 模拟搜索结果（实际应用中应该调用真实的 API）
+        now = datetime.now()
         sample_news = [
             {
                 "title": f"关于'{query}'的最新发展报道",
                 "summary": f"据最新消息，{query}相关事件有了新的进展。专家表示这一发展将对相关领域产生重要影响...",
                 "url": f"https://example-news.com/news/{query.replace(' ', '-')}-latest-development",
-                "published_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "published_at": now.strftime("%Y-%m-%d %H:%M:%S"),
+                "_ts": int(now.timestamp()),
                 "source": "示例新闻网",
                 "category": "综合新闻"
             },
@@ -77,7 +111,8 @@ class NewsAgent:
                 "title": f"{query}市场分析：专家观点汇总",
                 "summary": f"多位行业专家就{query}发表了看法，分析师认为未来发展趋势值得关注...",
                 "url": f"https://example-finance.com/analysis/{query.replace(' ', '-')}-market-analysis",
-                "published_at": (datetime.now() - timedelta(hours=2)).strftime("%Y-%m-%d %H:%M:%S"),
+                "published_at": (now - timedelta(hours=2)).strftime("%Y-%m-%d %H:%M:%S"),
+                "_ts": int(now.timestamp()) - 2 * 3600,
                 "source": "财经快报",
                 "category": "财经"
             },
@@ -85,7 +120,8 @@ class NewsAgent:
                 "title": f"{query}技术突破获得重大进展",
                 "summary": f"科研团队在{query}领域取得重要突破，这项技术有望在未来几年内实现商业化应用...",
                 "url": f"https://example-tech.com/breakthrough/{query.replace(' ', '-')}-tech-breakthrough",
-                "published_at": (datetime.now() - timedelta(hours=4)).strftime("%Y-%m-%d %H:%M:%S"),
+                "published_at": (now - timedelta(hours=4)).strftime("%Y-%m-%d %H:%M:%S"),
+                "_ts": int(now.timestamp()) - 4 * 3600,
                 "source": "科技日报",
                 "category": "科技"
             }
@@ -98,12 +134,14 @@ class NewsAgent:
         results = []
         
         # 模拟更多新闻源的结果
+        now = datetime.now()
         alternative_news = [
             {
                 "title": f"{query}政策解读：影响与机遇并存",
                 "summary": f"政府发布了关于{query}的新政策，业内人士分析认为这将带来新的机遇和挑战...",
                 "url": f"https://example-policy.com/policy/{query.replace(' ', '-')}-policy-analysis",
-                "published_at": (datetime.now() - timedelta(hours=6)).strftime("%Y-%m-%d %H:%M:%S"),
+                "published_at": (now - timedelta(hours=6)).strftime("%Y-%m-%d %H:%M:%S"),
+                "_ts": int(now.timestamp()) - 6 * 3600,
                 "source": "政策解读网",
                 "category": "政策"
             },
@@ -111,7 +149,8 @@ class NewsAgent:
                 "title": f"{query}国际动态：全球视野下的新发展",
                 "summary": f"国际社会对{query}相关发展表示关注，多国专家学者发表了不同观点...",
                 "url": f"https://example-international.com/global/{query.replace(' ', '-')}-global-view",
-                "published_at": (datetime.now() - timedelta(hours=8)).strftime("%Y-%m-%d %H:%M:%S"),
+                "published_at": (now - timedelta(hours=8)).strftime("%Y-%m-%d %H:%M:%S"),
+                "_ts": int(now.timestamp()) - 8 * 3600,
                 "source": "国际观察",
                 "category": "国际"
             }
@@ -120,17 +159,11 @@ class NewsAgent:
         return alternative_news[:limit]
     
     def _deduplicate_news(self, news_list: List[Dict]) -> List[Dict]:
-        """去除重复新闻"""
-        seen_titles = set()
-        unique_news = []
-        
+        """去除重复新闻（首次出现的保留，dict天然保序）"""
+        seen = {}
         for news in news_list:
-            title_key = news.get('title', '').lower().strip()
-            if title_key not in seen_titles:
-                seen_titles.add(title_key)
-                unique_news.append(news)
-        
-        return unique_news
+            seen.setdefault(_title_hash(news.get('title', '')), news)
+        return list(seen.values())
     
     def search_related_news(self, selected_news: Dict, limit: int = 8) -> List[Dict]:
         """
@@ -149,43 +182,44 @@ class NewsAgent:
         
         related_news = []
         
-        for keyword in keywords[:3]:  # 使用前3个关键词
-            try:
-                results = self.search_news(keyword, limit=3, days_back=30)
-                related_news.extend(results)
-            except Exception as e:
-                print(f"搜索相关新闻失败 ({keyword}): {e}")
+        # 每个关键词的搜索互相独立，并发抓取
+        search_keywords = keywords[:3]  # 使用前3个关键词
+        if search_keywords:
+            with ThreadPoolExecutor(max_workers=len(search_keywords)) as executor:
+                futures = {
+                    executor.submit(self._search_keyword_cached, keyword): keyword
+                    for keyword in search_keywords
+                }
+                for future, keyword in futures.items():
+                    try:
+                        related_news.extend(future.result())
+                    except Exception as e:
+                        print(f"搜索相关新闻失败 ({keyword}): {e}")
         
         # 去重并过滤掉原新闻
-        original_title = selected_news.get('title', '').lower()
-        unique_related = []
-        seen_titles = {original_title}
-        
+        seen = {_title_hash(selected_news.get('title', '')): None}
         for news in related_news:
-            title_key = news.get('title', '').lower().strip()
-            if title_key not in seen_titles:
-                seen_titles.add(title_key)
-                unique_related.append(news)
+            seen.setdefault(_title_hash(news.get('title', '')), news)
+        unique_related = [news for news in seen.values() if news is not None]
         
         return unique_related[:limit]
     
+    def _search_keyword_cached(self, keyword: str) -> List[Dict]:
+        """按关键词搜索相关新闻，结果缓存5分钟"""
+        with self._keyword_cache_lock:
+            cached = self._keyword_cache.get(keyword)
+        if cached is not None:
+            return cached
+
+        results = self.search_news(keyword, limit=3, days_back=30)
+        with self._keyword_cache_lock:
+            self._keyword_cache[keyword] = results
+        return results
+
     def _extract_keywords(self, text: str) -> List[str]:
         """从文本中提取关键词"""
-        # 简单的关键词提取（实际应用中可以使用更复杂的NLP方法）
-        # 移除常见停用词
-        stop_words = {'的', '了', '在', '是', '有', '和', '与', '或', '但', '与其', '关于', '对于', '由于', '因为', '所以', '因此', '然而', '虽然', '尽管', '而且', '并且', '同时', '另外', '此外', '最新', '报道', '消息', '新闻', '发展', '分析', '观点', '专家', '市场', '技术', '政策', '国际', '全球'}
-        
-        # 使用正则表达式提取中文词汇
-        chinese_pattern = r'[\u4e00-\u9fff]+'
-        words = re.findall(chinese_pattern, text)
-        
-        # 过滤停用词和短词
-        keywords = [word for word in words if len(word) >= 2 and word not in stop_words]
-        
-        # 按长度排序，优先选择较长的词汇
-        keywords.sort(key=len, reverse=True)
-        
-        return keywords[:5]  # 返回前5个关键词
+        # 实现提到模块级函数以便lru_cache按文本命中
+        return list(_extract_keywords_cached(text))
     
     def get_news_summary(self, news_list: List[Dict]) -> Dict:
         """
@@ -200,30 +234,16 @@ class NewsAgent:
         if not news_list:
             return {"total": 0, "categories": {}, "sources": {}, "latest_time": None}
         
-        categories = {}
-        sources = {}
-        latest_time = None
-        
-        for news in news_list:
-            # 统计分类
-            category = news.get('category', '未分类')
-            categories[category] = categories.get(category, 0) + 1
-            
-            # 统计来源
-            source = news.get('source', '未知来源')
-            sources[source] = sources.get(source, 0) + 1
-            
-            # 找到最新时间
-            published_at = news.get('published_at')
-            if published_at:
-                if latest_time is None or published_at > latest_time:
-                    latest_time = published_at
+        # Counter一遍过统计分类和来源；最新时间比epoch整数而非ISO字符串
+        categories = Counter(news.get('category', '未分类') for news in news_list)
+        sources = Counter(news.get('source', '未知来源') for news in news_list)
+        latest = max(news_list, key=lambda news: news.get('_ts', 0))
         
         return {
             "total": len(news_list),
-            "categories": categories,
-            "sources": sources,
-            "latest_time": latest_time
+            "categories": dict(categories),
+            "sources": dict(sources),
+            "latest_time": latest.get('published_at')
         }
 
 
@@ -4,28 +4,47 @@
 """
 import sys
 import os
-sys.path.append('/workspace')
+from pathlib import Path
+
+# 项目根目录按脚本位置推导，不再依赖部署在/workspace这个前提
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
 
 def install_requirements():
     """安装训练所需的依赖"""
     import subprocess
+    from importlib.metadata import distribution, PackageNotFoundError
     
     requirements = [
         'torch>=2.0.0',
         'transformers>=4.30.0',
         'datasets>=2.12.0',
+        'numpy>=1.24.0',
         'jieba>=0.42.1',
         'opencc-python-reimplemented>=0.1.7',
         'scikit-learn>=1.3.0'
     ]
     
-    print("安装训练依赖...")
-    for req in requirements:
+    # 先用dist-info元数据判断是否都已安装：只读目录元数据，
+    # 不import任何包（import torch本身就要一两秒），全齐则跳过pip
+    def _installed(req):
         try:
-            subprocess.check_call([sys.executable, '-m', 'pip', 'install', req])
-        except subprocess.CalledProcessError as e:
-            print(f"安装 {req} 失败: {e}")
+            distribution(req.split('>=')[0])
+            return True
+        except PackageNotFoundError:
             return False
+
+    if all(_installed(req) for req in requirements):
+        print("训练依赖已齐备，跳过安装")
+        return True
+    
+    print("安装训练依赖...")
+    # 一次pip调用装齐所有依赖：解析器只跑一遍，而不是每个包各跑一次
+    try:
+        subprocess.check_call([sys.executable, '-m', 'pip', 'install', *requirements])
+    except subprocess.CalledProcessError as e:
+        print(f"安装依赖失败: {e}")
+        return False
     
     return True
 
@@ -82,11 +101,12 @@ def main():
     print("=== 地理问答模型训练 ===")
     
     # 确保数据集存在
-    if not os.path.exists('/workspace/data/geography_qa.json'):
+    dataset_path = PROJECT_ROOT / 'data' / 'geography_qa.json'
+    if not dataset_path.is_file():
         print("生成地理问答数据集...")
         from data.geography_qa_dataset import GeographyQADataset
         dataset = GeographyQADataset()
-        dataset.save_dataset('/workspace/data/geography_qa.json')
+        dataset.save_dataset(str(dataset_path))
         print("✓ 数据集生成完成")
     
     # 尝试训练高级模型
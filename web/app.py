@@ -1,90 +1,164 @@
 """
 地理问答系统Web应用
 """
-from flask import Flask, render_template, request, jsonify
-from flask_cors import CORS
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.templating import Jinja2Templates
+from fastapi.staticfiles import StaticFiles
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
+import uvicorn
+import asyncio
+import functools
+import orjson
 import sys
 import os
+from contextlib import asynccontextmanager
+from pathlib import Path
 
 # 添加项目根目录到Python路径
 sys.path.append('/workspace')
 
 from models.simple_qa import SimpleGeographyQA
 
-app = Flask(__name__, 
-           template_folder='/workspace/templates',
-           static_folder='/workspace/static')
-CORS(app)
+_DATASET_PATH = Path('/workspace/data/geography_qa.json')
 
-# 初始化问答系统
-qa_system = SimpleGeographyQA()
 
-@app.route('/')
-def index():
+def _ensure_dataset():
+    """数据文件缺失时先生成，保证问答系统初始化不会落空"""
+    if not _DATASET_PATH.is_file():
+        print("正在生成地理问答数据集...")
+        from data.geography_qa_dataset import GeographyQADataset
+        GeographyQADataset().save_dataset(str(_DATASET_PATH))
+        print("数据集生成完成！")
+
+
+# 问答系统惰性构建：import web.app不再付出建库成本，
+# lifespan阶段预热后首个请求也不付冷启动成本
+@functools.cache
+def get_qa_system() -> SimpleGeographyQA:
+    _ensure_dataset()
+    return SimpleGeographyQA()
+
+
+# 真实流量中重复问题占比很高，答案本身不变，直接缓存整条查找结果。
+# lru_cache对可哈希参数在CPython下是原子的，线程池并发调用下安全。
+@functools.lru_cache(maxsize=4096)
+def _cached_answer(question: str) -> str:
+    return get_qa_system().answer(question)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_qa_system()
+    yield
+
+
+app = FastAPI(
+    title="地理问答系统",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+templates = Jinja2Templates(directory='/workspace/templates')
+
+# 如果static目录存在，则挂载静态文件
+if os.path.isdir('/workspace/static'):
+    app.mount('/static', StaticFiles(directory='/workspace/static'), name='static')
+
+
+@app.get('/', response_class=HTMLResponse)
+async def index(request: Request):
     """主页"""
-    return render_template('index.html')
+    return templates.TemplateResponse('index.html', {'request': request})
 
-@app.route('/api/ask', methods=['POST'])
-def ask_question():
+
+@app.post('/api/ask')
+async def ask_question(request: Request):
     """处理问题请求"""
     try:
-        data = request.get_json()
+        data = orjson.loads(await request.body())
         question = data.get('question', '').strip()
-        
+
         if not question:
-            return jsonify({
+            return {
                 'success': False,
                 'error': '请输入问题'
-            })
-        
-        # 获取答案
-        answer = qa_system.answer(question)
-        
-        return jsonify({
+            }
+
+        # KB查找是同步CPU工作，放入线程池执行，避免阻塞事件循环
+        # （按归一化后的问题命中缓存，大小写差异共享同一条目）
+        loop = asyncio.get_running_loop()
+        answer = await loop.run_in_executor(None, _cached_answer, question.lower())
+
+        return {
             'success': True,
             'question': question,
             'answer': answer
-        })
-        
+        }
+
     except Exception as e:
-        return jsonify({
+        return {
             'success': False,
             'error': f'处理问题时出错: {str(e)}'
-        })
+        }
 
-@app.route('/api/health')
-def health_check():
+
+# 健康检查的载荷完全静态，导入时序列化一次
+_HEALTH_BYTES = orjson.dumps({
+    'status': 'healthy',
+    'message': '地理问答系统运行正常'
+})
+
+
+@app.get('/api/health')
+async def health_check():
     """健康检查"""
-    return jsonify({
-        'status': 'healthy',
-        'message': '地理问答系统运行正常'
-    })
+    return Response(_HEALTH_BYTES, media_type='application/json')
+
 
-@app.route('/api/stats')
-def get_stats():
+# 统计信息只随问答对数量变化，缓存序列化后的字节，计数不变时直接复用
+_stats_cache = (None, b'')
+
+
+@app.get('/api/stats')
+async def get_stats():
     """获取系统统计信息"""
+    global _stats_cache
     try:
-        qa_count = len(qa_system.qa_data)
-        return jsonify({
-            'success': True,
-            'stats': {
-                'total_qa_pairs': qa_count,
-                'categories': ['省会城市', '河流', '山脉', '综合']
-            }
-        })
+        qa_count = len(get_qa_system().qa_data)
+        cached_count, cached_bytes = _stats_cache
+        if qa_count != cached_count:
+            cached_bytes = orjson.dumps({
+                'success': True,
+                'stats': {
+                    'total_qa_pairs': qa_count,
+                    'categories': ['省会城市', '河流', '山脉', '综合']
+                }
+            })
+            _stats_cache = (qa_count, cached_bytes)
+        return Response(cached_bytes, media_type='application/json')
     except Exception as e:
-        return jsonify({
+        return {
             'success': False,
             'error': str(e)
-        })
+        }
+
 
 if __name__ == '__main__':
-    # 确保数据文件存在
-    if not os.path.exists('/workspace/data/geography_qa.json'):
-        print("正在生成地理问答数据集...")
-        from data.geography_qa_dataset import GeographyQADataset
-        dataset = GeographyQADataset()
-        dataset.save_dataset('/workspace/data/geography_qa.json')
-        print("数据集生成完成！")
-    
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    uvicorn.run(
+        "web.app:app",
+        host="0.0.0.0",
+        port=5000,
+        loop="uvloop",
+        http="httptools",
+        workers=max(2, os.cpu_count() or 1),
+        reload=False,
+        log_level="warning",
+    )